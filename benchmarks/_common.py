@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+
+# Helpers shared by the benchmarks, which run straight from a checkout:
+#
+#     python benchmarks/bench_line_reader.py
+
+from typing import (
+    Any as _Any,
+    Callable as _Callable,
+    Dict as _Dict,
+    List as _List,
+    Tuple as _Tuple,
+)
+
+import json as _json
+import numbers as _numbers
+import os as _os
+import random as _random
+import sys as _sys
+import time as _time
+import typing as _typing
+
+sys_path = _os.path.join(
+    _os.path.dirname(_os.path.dirname(_os.path.abspath(__file__))), 'src'
+)
+if sys_path not in _sys.path:
+    _sys.path.insert(0, sys_path)
+
+
+EPOCH = 1600000000
+
+
+def elite_time(t: int) -> str:
+
+    return _time.strftime('%Y-%m-%dT%H:%M:%SZ', _time.gmtime(EPOCH + t))
+
+
+def log_name(t: int, part: int = 1, suffix: str = '') -> str:
+
+    return _time.strftime(f'Journal.%y%m%d%H%M%S.{part:02}.log{suffix}',
+                          _time.gmtime(EPOCH + t))
+
+
+# A mix of short lines and the long ones the game writes at session start.
+def _records(i: int) -> _Dict[str, _Any]:
+
+    kind = i % 4
+
+    if kind == 0:
+        return {'event': 'Music', 'MusicTrack': 'Exploration'}
+
+    if kind == 1:
+        return {'event': 'MarketSell', 'MarketID': 3228342528 + i % 13,
+                'Type': 'gold', 'Count': 4, 'SellPrice': 9401,
+                'TotalSale': 37604, 'AvgPricePaid': 9112}
+
+    if kind == 2:
+        return {'event': 'Materials',
+                'Raw': [{'Name': name, 'Count': 150}
+                        for name in ('iron', 'nickel', 'carbon', 'sulphur',
+                                     'zinc', 'chromium', 'vanadium')],
+                'Manufactured': [], 'Encoded': []}
+
+    return {'event': 'FSDJump', 'StarSystem': f'HIP {i}',
+            'SystemAddress': 10477373803 + i, 'StarPos': [1.5, -2.0, 30.25],
+            'JumpDist': 12.5, 'FuelUsed': 1.25, 'FuelLevel': 30.0}
+
+
+def journal_lines(count: int, start: int = 0, part: int = 1,
+                  continued: bool = False) -> _List[bytes]:
+
+    records = [{'timestamp': elite_time(start), 'event': 'Fileheader',
+                'part': part, 'language': 'English/UK',
+                'gameversion': '4.0.0.1450', 'build': 'r286858/r0 '}]
+
+    records += [dict(timestamp=elite_time(start + i), **_records(i))
+                for i in range(count)]
+
+    if continued:
+        records.append({'timestamp': elite_time(start + count),
+                        'event': 'Continued', 'part': part + 1})
+
+    return [_json.dumps(record).encode('utf-8') + b'\n'
+            for record in records]
+
+
+def write_log(path: str, count: int, **kwargs) -> int:
+
+    data = b''.join(journal_lines(count, **kwargs))
+
+    with open(path, 'wb') as f:
+        f.write(data)
+
+    return len(data)
+
+
+def best_of(func: _Callable[[], _Any], repeat: int = 5) -> float:
+
+    best = float('inf')
+
+    for _ in range(repeat):
+        start = _time.perf_counter()
+        func()
+        best = min(best, _time.perf_counter() - start)
+
+    return best
+
+
+def _sample(cls: type, rng: _random.Random) -> _Dict[str, _Any]:
+
+    # A plausible journal mapping with every attribute of a Data class.
+
+    from continued import types
+
+    data = {}
+
+    # noinspection PyProtectedMember
+    for name, attr in cls._attrs.items():
+
+        typ = attr.type
+        origin = _typing.get_origin(typ) or typ
+
+        if attr.delegate:
+            if issubclass(origin, types.L):
+                data[attr.key[0]] = f'${name};'
+                data[attr.key[1]] = name.title()
+            else:
+                data.update(_sample(typ, rng))
+
+        elif name == '_event_name':
+            data[attr.key] = cls.__name__
+
+        elif name == '_timestamp' or origin is types.DateTime:
+            data[attr.key] = elite_time(rng.randrange(10 ** 7))
+
+        elif origin is types.Coords:
+            data[attr.key] = [1.5, -2.0, 30.25]
+
+        elif isinstance(origin, type) and issubclass(origin, types.Data):
+            data[attr.key] = _sample(typ, rng)
+
+        elif origin is tuple:
+            args = _typing.get_args(typ)
+            item = args[0] if args else int
+            if isinstance(item, type) and issubclass(item, types.Data):
+                data[attr.key] = [_sample(item, rng) for _ in range(3)]
+            else:
+                data[attr.key] = [1, 2, 3]
+
+        elif origin is bool:
+            data[attr.key] = True
+
+        elif issubclass(origin, _numbers.Integral):
+            data[attr.key] = rng.randrange(10 ** 12)
+
+        elif issubclass(origin, _numbers.Real):
+            data[attr.key] = rng.random()
+
+        elif issubclass(origin, str):
+            data[attr.key] = f'v_{name}'
+
+        elif origin is dict:
+            data[attr.key] = {'Main': 1.0}
+
+        else:
+            data[attr.key] = 'x'
+
+    return data
+
+
+def event_samples() -> _List[_Tuple[type, _Dict[str, _Any]]]:
+
+    # One sample of every event class, each with an unknown key as well.
+
+    from continued import events
+
+    samples = []
+
+    # noinspection PyProtectedMember
+    for name, cls in sorted(events.LogEvent._all.items()):
+        data = _sample(cls, _random.Random(name))
+        data['event'] = name
+        data['UnknownKey'] = {'a': [1]}
+        samples.append((cls, data))
+
+    return samples
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+
+# Out of order enqueue, find and purge on the snapshot buffer of
+# _DataFile, which bisects a sorted list, against the deque scanned
+# newest first that it used to keep.
+
+import argparse
+import collections
+import random
+
+import _common
+
+from continued import events
+from continued.journal import _DataFile
+
+
+class _DequeBuffer:
+
+    def __init__(self, event_cls, path, backlog):
+
+        self._buffer = collections.deque(maxlen=1 + backlog)
+
+    def enqueue(self, event):
+
+        if not self._buffer or event >= self._buffer[0]:
+            self._buffer.appendleft(event)
+            return
+
+        if len(self._buffer) == self._buffer.maxlen:
+            self._buffer.pop()
+
+        for i, compare in enumerate(self._buffer):
+            if event >= compare:
+                self._buffer.insert(i, event)
+                break
+        else:
+            self._buffer.append(event)
+
+    def find(self, timestamp):
+
+        if not self._buffer:
+            return None
+
+        event = self._buffer[0]
+        if timestamp >= event._timestamp:
+            return event if timestamp == event._timestamp else None
+
+        for event in reversed(self._buffer):
+            if timestamp <= event._timestamp:
+                return event
+
+    def purge_up_to(self, timestamp):
+
+        if not self._buffer:
+            return
+
+        if timestamp >= self._buffer[0]._timestamp:
+            self._buffer.clear()
+            return
+
+        while timestamp >= self._buffer[-1]._timestamp:
+            self._buffer.pop()
+
+
+def _market(second: int) -> events.Market:
+
+    return events.Market.from_dict({
+        'event': 'Market',
+        'timestamp': _common.elite_time(second),
+        'MarketID': second,
+    })
+
+
+# noinspection PyProtectedMember
+def _run(buffer_cls, backlog, ordered, shuffled) -> float:
+
+    def run():
+
+        buffer = buffer_cls(events.Market, 'Market.json', backlog=backlog)
+        for event in shuffled:
+            buffer.enqueue(event)
+        for event in ordered[::7]:
+            buffer.find(event._timestamp)
+        for event in ordered[::50]:
+            buffer.purge_up_to(event._timestamp)
+
+    return _common.best_of(run)
+
+
+def main() -> None:
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--events', type=int, default=5000)
+    args = parser.parse_args()
+
+    ordered = [_market(i) for i in range(args.events)]
+    shuffled = ordered[:]
+    random.Random(1).shuffle(shuffled)
+
+    for backlog in (10, 1000):
+        deque = _run(_DequeBuffer, backlog, ordered, shuffled)
+        bisect = _run(_DataFile, backlog, ordered, shuffled)
+        print(f"backlog {backlog:4}: deque {deque * 1e3:7.1f} ms"
+              f"  bisect {bisect * 1e3:7.1f} ms  ({deque / bisect:.1f}x)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+
+# Throughput of Backfill over the same journal stored plain and with each
+# codec journal logs may be archived with, in one process and in four.
+
+import argparse
+import bz2
+import gzip
+import lzma
+import pathlib
+import tempfile
+import time
+
+import _common
+
+import trio
+
+from continued import journal
+
+try:
+    import zstandard
+
+except ImportError:
+    zstandard = None
+
+
+_CODECS = {
+    '': None,
+    '.gz': gzip.compress,
+    '.bz2': bz2.compress,
+    '.xz': lzma.compress,
+}
+
+if zstandard is not None:
+    _CODECS['.zst'] = zstandard.ZstdCompressor().compress
+
+
+def _write_logs(path: pathlib.Path, files: int, lines: int) -> int:
+
+    size = 0
+
+    for i in range(files):
+        start = i * 2 * (lines + 1)
+        size += _common.write_log(
+            str(path / _common.log_name(start)), lines, start=start,
+            continued=True)
+        size += _common.write_log(
+            str(path / _common.log_name(start, part=2)), lines,
+            start=start + lines + 1, part=2)
+
+    return size
+
+
+async def _backfill(path: pathlib.Path, processes: int):
+
+    backfill = journal.Backfill(trio.Path(path), processes=processes)
+    start = time.perf_counter()
+    events = [event async for event in backfill]
+    return len(events), time.perf_counter() - start
+
+
+def main() -> None:
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--files', type=int, default=4)
+    parser.add_argument('--lines', type=int, default=25000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        plain = pathlib.Path(tmp, 'plain')
+        plain.mkdir()
+        size = _write_logs(plain, args.files, args.lines)
+
+        # Decoders are generated on first use.
+        expected, _ = trio.run(_backfill, plain, 1)
+
+        for suffix, compress in _CODECS.items():
+            path = plain
+
+            if compress is not None:
+                path = pathlib.Path(tmp, suffix[1:])
+                path.mkdir()
+                for log in plain.iterdir():
+                    (path / (log.name + suffix)).write_bytes(
+                        compress(log.read_bytes()))
+
+            stored = sum(log.stat().st_size for log in path.iterdir())
+
+            for processes in (1, 4):
+                events, elapsed = trio.run(_backfill, path, processes)
+                assert events == expected, (suffix, events)
+                print(f"{suffix or 'plain':5} x{processes}:"
+                      f" {events / elapsed:9.0f} events/s"
+                      f" {size / elapsed / 1e6:6.1f} MB/s"
+                      f"  ratio {size / stored:4.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+
+# Decoding every event class from a sample mapping with the generic,
+# attribute-by-attribute decoder and with the one generated per class.
+
+import argparse
+import copy
+import time
+
+import _common
+
+
+def _time_decode(decode, samples, number: int) -> float:
+
+    best = float('inf')
+
+    for _ in range(5):
+        inputs = [copy.deepcopy(data) for _ in range(number)
+                  for data in samples]
+
+        start = time.perf_counter()
+        for data in inputs:
+            decode(data)
+        best = min(best, time.perf_counter() - start)
+
+    return best / len(inputs)
+
+
+# noinspection PyProtectedMember
+def main() -> None:
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--number', type=int, default=200)
+    parser.add_argument('--verbose', '-v', action='store_true')
+    args = parser.parse_args()
+
+    generic_total = generated_total = 0.0
+
+    for cls, data in _common.event_samples():
+        generic = _time_decode(cls._decode_generic, [data], args.number)
+        generated = _time_decode(cls._decode, [data], args.number)
+
+        generic_total += generic
+        generated_total += generated
+
+        if args.verbose:
+            print(f"{cls.__name__:32} {generic * 1e6:8.2f} us"
+                  f" {generated * 1e6:8.2f} us"
+                  f" {generic / generated:5.2f}x")
+
+    print(f"all event classes: generic {generic_total * 1e6:.1f} us,"
+          f" generated {generated_total * 1e6:.1f} us,"
+          f" {generic_total / generated_total:.2f}x")
+
+
+if __name__ == '__main__':
+    main()
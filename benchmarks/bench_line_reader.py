@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+
+# Thread hops and lines per second when reading a journal log, line by
+# line through trio's file wrapper as _Journal used to, and in chunks
+# through _LineReader. Each call on the wrapper is one worker thread hop.
+
+import argparse
+import os
+import tempfile
+
+import _common
+
+import trio
+
+from continued.journal import EventMap, _Journal, _LineReader
+
+
+class _CountingFile:
+
+    def __init__(self, f) -> None:
+
+        self._f = f
+        self.calls = 0
+
+    def read(self, *args):
+
+        self.calls += 1
+        return self._f.read(*args)
+
+    def readline(self, *args):
+
+        self.calls += 1
+        return self._f.readline(*args)
+
+    def close(self) -> None:
+
+        self._f.close()
+
+
+# noinspection PyProtectedMember
+async def _per_line(path: str, journal: _Journal, decode: bool):
+
+    raw = _CountingFile(open(path, 'rb'))
+
+    async with trio.wrap_file(raw) as f:
+        async for line in f:
+            if decode:
+                data = journal._decode_line(line)
+                journal._make_event(data.get('event'), data)
+
+    return raw.calls
+
+
+# noinspection PyProtectedMember
+async def _chunked(path: str, journal: _Journal, decode: bool):
+
+    raw = _CountingFile(open(path, 'rb'))
+
+    async with trio.wrap_file(raw) as f:
+        async for line in _LineReader(f):
+            if decode:
+                data = journal._decode_line(line)
+                journal._make_event(data.get('event'), data)
+
+    return raw.calls
+
+
+def main() -> None:
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--lines', type=int, nargs='+', default=[500, 20000])
+    args = parser.parse_args()
+
+    EventMap.set({})
+    journal = _Journal()
+
+    with tempfile.TemporaryDirectory() as tmp:
+
+        for count in args.lines:
+            path = os.path.join(tmp, _common.log_name(0))
+            size = _common.write_log(path, count)
+            print(f"{count} lines, {size / 1e6:.1f} MB")
+
+            for decode in (False, True):
+                for label, read in (('per line', _per_line),
+                                    ('chunked', _chunked)):
+
+                    hops = None
+
+                    def run():
+                        nonlocal hops
+                        hops = trio.run(read, path, journal, decode)
+
+                    seconds = _common.best_of(run, repeat=3)
+
+                    print(f"  {label:8} {'decode' if decode else 'read':6}"
+                          f" {hops:7} hops"
+                          f" {count / seconds:12,.0f} lines/s")
+
+
+if __name__ == '__main__':
+    main()
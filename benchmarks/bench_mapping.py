@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+
+# Mapping access to events, the way EDMC-style plugins use them, next to
+# the same operations on a plain dict with the same items.
+
+import argparse
+import timeit
+
+import _common
+
+
+_OPERATIONS = (
+    ('getitem', 'o[k]'),
+    ('contains', 'k in o'),
+    ('len', 'len(o)'),
+    ('iter', 'list(o)'),
+    ('keys', 'list(o.keys())'),
+    ('items', 'list(o.items())'),
+    ('values', 'list(o.values())'),
+)
+
+
+def _time(stmt: str, obj, key, number: int) -> float:
+
+    return min(timeit.repeat(stmt, globals={'o': obj, 'k': key},
+                             number=number, repeat=5)) / number
+
+
+def main() -> None:
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument('events', nargs='*',
+                        default=['FSDJump', 'Docked', 'Music'])
+    parser.add_argument('--number', type=int, default=20000)
+    args = parser.parse_args()
+
+    samples = {cls.__name__: (cls, data)
+               for cls, data in _common.event_samples()}
+
+    for name in args.events:
+        cls, data = samples[name]
+        obj = cls.from_dict(data)
+        plain = dict(obj.items())
+        key = 'event'
+
+        print(f"{name} ({len(plain)} keys)")
+
+        for label, stmt in _OPERATIONS:
+            event = _time(stmt, obj, key, args.number)
+            reference = _time(stmt, plain, key, args.number)
+            print(f"  {label:9} {event * 1e6:7.3f} us"
+                  f"  (dict {reference * 1e6:.3f} us)")
+
+
+if __name__ == '__main__':
+    main()
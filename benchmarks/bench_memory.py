@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+
+# Bytes per event for events whose nested values use the compact layout,
+# decoded as usual and with the same values moved back into dict entries.
+
+import argparse
+import copy
+import sys
+
+import _common
+
+from continued import events, types
+
+
+_SCAN = {
+    'timestamp': _common.elite_time(0), 'event': 'Scan',
+    'ScanType': 'Detailed', 'BodyName': 'Col 285 Sector AB-C d1 1',
+    'BodyID': 5, 'Parents': [{'Star': 0}], 'StarSystem': 'Col 285 Sector',
+    'SystemAddress': 10477373803, 'DistanceFromArrivalLS': 1.5,
+    'TidalLock': False, 'TerraformState': '', 'PlanetClass': 'Icy body',
+    'Atmosphere': 'thin nitrogen atmosphere',
+    'AtmosphereType': 'Nitrogen', 'Volcanism': '', 'MassEM': 0.1,
+    'Radius': 1000000.0, 'SurfaceGravity': 1.0, 'SurfaceTemperature': 80.0,
+    'SurfacePressure': 100.0, 'Landable': True,
+    'Materials': [{'Name': name, 'Percent': 10.0}
+                  for name in ('iron', 'nickel', 'sulphur', 'carbon',
+                               'chromium', 'germanium', 'zinc', 'arsenic',
+                               'niobium', 'tin')],
+    'AtmosphereComposition': [{'Name': name, 'Percent': 33.0}
+                              for name in ('Nitrogen', 'Oxygen', 'Argon')],
+    'Composition': {'Ice': 0.5, 'Rock': 0.4, 'Metal': 0.1},
+    'SemiMajorAxis': 1.0, 'Eccentricity': 0.0, 'OrbitalInclination': 0.0,
+    'Periapsis': 0.0, 'OrbitalPeriod': 1.0, 'RotationPeriod': 1.0,
+    'AxialTilt': 0.0,
+    'Rings': [{'Name': f'Col 285 Sector AB-C d1 1 {c} Ring',
+               'RingClass': 'eRingClass_Icy', 'MassMT': 1.0,
+               'InnerRad': 1.0, 'OuterRad': 2.0} for c in 'AB'],
+    'WasDiscovered': True, 'WasMapped': False,
+}
+
+_MARKET = {
+    'timestamp': _common.elite_time(0), 'event': 'Market',
+    'MarketID': 3228342528, 'StationName': 'Jameson Memorial',
+    'StarSystem': 'Shinrarta Dezhra',
+    'Items': [{'id': 128049152 + i, 'Name': f'$commodity_{i}_name;',
+               'Name_Localised': f'Commodity {i}',
+               'Category': '$MARKET_category_metals;',
+               'Category_Localised': 'Metals', 'BuyPrice': 1000 + i,
+               'SellPrice': 900 + i, 'MeanPrice': 950, 'StockBracket': 2,
+               'DemandBracket': 0, 'Stock': 5000, 'Demand': 1,
+               'Consumer': False, 'Producer': True, 'Rare': False}
+              for i in range(100)],
+}
+
+
+# noinspection PyProtectedMember
+def _with_dict_entries(obj):
+
+    # What the same values take in the dict layout: entries in a dict
+    # and an _unknown dict of their own.
+
+    if isinstance(obj, tuple):
+        return tuple(_with_dict_entries(value) for value in obj)
+
+    if not isinstance(obj, types.Data):
+        return obj
+
+    if isinstance(obj._data, types._CompactEntries):
+        entries = {name: value for name, value
+                   in zip(obj._attrs, tuple.__iter__(obj._data))
+                   if value is not types.ABSENT}
+        obj._data = entries
+        obj._unknown = dict(obj._unknown)
+
+    for name, value in obj._data.items():
+        obj._data[name] = _with_dict_entries(value)
+
+    return obj
+
+
+# noinspection PyProtectedMember
+def _deep_size(obj, seen) -> int:
+
+    # Sizes of everything reachable through Data values, each object
+    # counted once. Unlike tracemalloc, not fooled by CPython's free
+    # lists handing back the dicts of the decoded input.
+
+    if id(obj) in seen:
+        return 0
+
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+
+    if isinstance(obj, types.Data):
+        values = (tuple.__iter__(obj._data)
+                  if isinstance(obj._data, types._CompactEntries)
+                  else obj._data.values())
+        size += _deep_size(obj._data, seen) + _deep_size(obj._unknown, seen)
+        size += sum(_deep_size(value, seen) for value in values)
+
+    elif isinstance(obj, (tuple, list)):
+        size += sum(_deep_size(value, seen) for value in obj)
+
+    elif isinstance(obj, dict):
+        size += sum(_deep_size(value, seen) for value in obj.values())
+
+    return size
+
+
+def _bytes_per_event(decode, record, count: int) -> float:
+
+    # Objects shared between events, such as flyweights and interned
+    # values, count for the first event only. All are kept alive so that
+    # no id in seen is reused.
+
+    objs = [decode(copy.deepcopy(record)) for _ in range(count)]
+    seen = set()
+
+    return sum(_deep_size(obj, seen) for obj in objs) / count
+
+
+# noinspection PyProtectedMember
+def main() -> None:
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--count', type=int, default=2000)
+    args = parser.parse_args()
+
+    for cls, record in ((events.Scan, _SCAN), (events.Market, _MARKET)):
+
+        for flyweights in types._Flyweights.all:
+            flyweights.clear()
+
+        compact = _bytes_per_event(cls._decode, record, args.count)
+        dicts = _bytes_per_event(
+            lambda data: _with_dict_entries(cls._decode(data)),
+            record, args.count
+        )
+
+        print(f"{cls.__name__:8} compact {compact:7,.0f} bytes/event,"
+              f" dict entries {dicts:7,.0f} bytes/event")
+
+
+if __name__ == '__main__':
+    main()
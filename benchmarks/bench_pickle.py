@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+
+# Size and speed of pickling events with Data.__reduce__, which packs the
+# attribute values into a tuple, against the default protocol: the slots
+# of each object with its _data and _unknown dicts.
+
+import argparse
+import copy
+import copyreg
+import io
+import pickle
+import timeit
+
+import _common
+
+from continued import types
+from continued.journal import _Journal
+
+
+class _DefaultPickler(pickle.Pickler):
+
+    # noinspection PyProtectedMember
+    def reducer_override(self, obj):
+
+        if not isinstance(obj, types.Data):
+            return NotImplemented
+
+        entries = (dict(obj._data.items())
+                   if isinstance(obj._data, types._CompactEntries)
+                   else dict(obj._data))
+
+        return (copyreg.__newobj__, (type(obj),),
+                (None, {'_data': entries, '_unknown': dict(obj._unknown)}))
+
+
+def _dumps_default(objs) -> bytes:
+
+    f = io.BytesIO()
+    _DefaultPickler(f, protocol=pickle.HIGHEST_PROTOCOL).dump(objs)
+    return f.getvalue()
+
+
+def _dumps_compact(objs) -> bytes:
+
+    return pickle.dumps(objs, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+# noinspection PyProtectedMember
+def _journal_events(count: int):
+
+    journal = _Journal()
+    events = []
+
+    for line in _common.journal_lines(count)[1:]:
+        data = journal._decode_line(line)
+        events.append(journal._make_event(data.get('event'), data))
+
+    return events
+
+
+def main() -> None:
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--lines', type=int, default=5000)
+    args = parser.parse_args()
+
+    samples = [cls.from_dict(copy.deepcopy(data))
+               for cls, data in _common.event_samples()]
+
+    for label, objs in (('event samples', samples),
+                        ('journal', _journal_events(args.lines))):
+
+        print(f"{label}: {len(objs)} events")
+
+        for name, dumps in (('default', _dumps_default),
+                            ('compact', _dumps_compact)):
+            data = dumps(objs)
+            assert pickle.loads(data) == objs
+
+            dump = min(timeit.repeat(lambda: dumps(objs),
+                                     number=3, repeat=3)) / 3
+            load = min(timeit.repeat(lambda: pickle.loads(data),
+                                     number=3, repeat=3)) / 3
+
+            print(f"  {name:8} {len(data) / len(objs):7.0f} bytes/event"
+                  f"  dumps {dump * 1e3:7.1f} ms  loads {load * 1e3:7.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
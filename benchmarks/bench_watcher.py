@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+
+# Cost of one polling tick in a journal folder with many archived logs,
+# for a watcher that stats every log and side file, as _JournalWatcher
+# used to, and for the current one, which stats only the active log and
+# the side files unless the folder itself changed.
+
+import argparse
+import os
+import pathlib
+import tempfile
+import time
+
+import _common
+
+import watchgod
+
+from continued.journal import _DATA_FILES, _JournalWatcher
+
+
+class _FullScanWatcher(watchgod.watcher.AllWatcher):
+
+    def _walk(self, path, changes, new_files) -> None:
+
+        for entry in os.scandir(path):
+            if entry.is_dir():
+                continue
+
+            if entry.name.endswith('.json'):
+                self._watch_file(entry.path, changes, new_files, entry.stat())
+                continue
+
+            if not entry.name.endswith('.log'):
+                continue
+
+            self._watch_file(entry.path, changes, new_files,
+                             os.stat(entry.path))
+
+
+def _make_folder(path: str, logs: int) -> None:
+
+    for i in range(logs):
+        open(os.path.join(path, _common.log_name(i * 3600)), 'wb').close()
+
+    for _, file_name in _DATA_FILES:
+        with open(os.path.join(path, file_name), 'w') as f:
+            f.write('{}')
+
+
+def main() -> None:
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--logs', type=int, nargs='+', default=[100, 10000])
+    parser.add_argument('--ticks', type=int, default=50)
+    args = parser.parse_args()
+
+    for logs in args.logs:
+        with tempfile.TemporaryDirectory() as tmp:
+
+            _make_folder(tmp, logs)
+
+            # Let the folder settle, or the current watcher keeps rescanning
+            # it in case its mtime missed a file.
+            time.sleep(_JournalWatcher.SETTLE_NS / 1e9 + 0.1)
+
+            print(f"{logs} logs")
+
+            for cls in (_FullScanWatcher, _JournalWatcher):
+                watcher = cls(pathlib.Path(tmp))
+
+                def ticks():
+                    for _ in range(args.ticks):
+                        watcher.check()
+
+                seconds = _common.best_of(ticks, repeat=3)
+                print(f"  {cls.__name__:16}"
+                      f" {seconds / args.ticks * 1e3:8.3f} ms/tick"
+                      f" {len(watcher.files):6} files tracked")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+
+from typing import (
+    Any as _Any,
+    Callable as _Callable,
+    Tuple as _Tuple,
+    Union as _Union,
+)
+
+import json as _json
+import re as _re
+
+
+_stdlib_decoder = _json.JSONDecoder(strict=True)
+
+# Integers that may not fit into 64 bits, which some backends silently
+# turn into floats. Also matches inside strings, which merely costs speed.
+_LONG_DIGITS = _re.compile(r'\d{20}')
+_LONG_DIGITS_BYTES = _re.compile(rb'\d{20}')
+
+
+def _decode_stdlib(data: _Union[bytes, bytearray, memoryview, str]) -> _Any:
+
+    if not isinstance(data, str):
+        data = bytes(data).decode('utf-8')
+
+    return _stdlib_decoder.decode(data)
+
+
+_Decoder = _Callable[[_Union[bytes, str]], _Any]
+
+
+def _load_backend(name: str) -> _Tuple[_Decoder, _Tuple[type, ...]]:
+
+    # The decoder of a backend along with the errors it raises on invalid
+    # input, which do not derive from ValueError in every version.
+
+    if name == 'orjson':
+        import orjson
+        return orjson.loads, (ValueError, orjson.JSONDecodeError)
+
+    if name == 'msgspec':
+        import msgspec
+        return msgspec.json.Decoder().decode, (ValueError,
+                                                msgspec.DecodeError)
+
+    if name == 'json':
+        return _decode_stdlib, (ValueError,)
+
+    raise ValueError(f"unknown JSON backend {name!r}")
+
+
+def _find_backend() -> _Tuple[str, _Decoder, _Tuple[type, ...]]:
+
+    for name in ('orjson', 'msgspec'):
+        try:
+            return (name, *_load_backend(name))
+
+        except ImportError:
+            pass
+
+    return ('json', *_load_backend('json'))
+
+
+BACKEND, _decode_fast, _DECODE_ERRORS = _find_backend()
+
+
+def decode(data: _Union[bytes, bytearray, memoryview, str]) -> _Any:
+
+    if _decode_fast is _decode_stdlib:
+        return _decode_stdlib(data)
+
+    if (_LONG_DIGITS if isinstance(data, str)
+            else _LONG_DIGITS_BYTES).search(data):
+        return _decode_stdlib(data)
+
+    try:
+        return _decode_fast(data)
+
+    except _DECODE_ERRORS:
+        pass
+
+    # The faster backends are stricter than the standard library in a few
+    # corners (e.g. NaN and Infinity), so let it have the final say. This
+    # also means invalid input always ends in the ValueError callers catch.
+    return _decode_stdlib(data)
@@ -0,0 +1,909 @@
+#!/usr/bin/env python3
+
+from typing import (
+    Any as _Any,
+    Dict as _Dict,
+    Iterable as _Iterable,
+    Iterator as _Iterator,
+    List as _List,
+    Mapping as _Mapping,
+    Optional as _Optional,
+    Sequence as _Sequence,
+    Set as _Set,
+    Tuple as _Tuple,
+    Union as _Union,
+)
+
+import io as _io
+import json as _json
+import os as _os
+import pathlib as _pathlib
+import shutil as _shutil
+
+import trio as _trio
+
+try:
+    import numpy as _np
+
+except ImportError:
+    _np = None
+
+try:
+    import pyarrow as _pa
+    import pyarrow.parquet as _pq
+
+except ImportError:
+    _pa = _pq = None
+
+from .types import L
+
+from .types import (
+    Data as _Data,
+    Timestamp as _Timestamp,
+)
+
+from . import data as _data
+from . import events as _events
+from . import journal as _journal
+from . import types as _types
+
+
+# Numeric columns of a commodity table, in the order of data.Commodity.
+# Absent values are stored as 0 or False and masked in the valid table.
+COMMODITY_FIELDS: _Tuple[_Tuple[str, str], ...] = (
+    ('id', 'i8'),
+    ('buy_price', 'i8'),
+    ('sell_price', 'i8'),
+    ('mean_price', 'i8'),
+    ('stock_bracket', 'i1'),
+    ('demand_bracket', 'i1'),
+    ('stock', 'i8'),
+    ('demand', 'i8'),
+    ('consumer', '?'),
+    ('producer', '?'),
+    ('rare', '?'),
+)
+
+# Columns holding codes into the interned names and categories.
+_CODE_FIELDS = (('name', 'i4'), ('category', 'i4'))
+
+
+def _require_numpy() -> None:
+
+    if _np is None:
+        raise ImportError("columnar tables need numpy")
+
+
+class _Vocabulary:
+
+    # Interns the L values of a column, numbering them in order of
+    # appearance. L compares by its string alone, so the key also
+    # includes the localised string.
+
+    __slots__ = ('values', '_codes')
+
+    values: _List[_Optional[L]]
+    _codes: _Dict[_Tuple[str, _Optional[str]], int]
+
+    def __init__(self) -> None:
+
+        self.values = []
+        self._codes = {}
+
+    def code(self, value: _Any) -> int:
+
+        if value is None:
+            key = None
+        elif isinstance(value, L):
+            key = str(value), value.localised
+        else:
+            key = str(value), None
+
+        try:
+            return self._codes[key]
+
+        except KeyError:
+            pass
+
+        if key is not None and not isinstance(value, L):
+            value = L(*key)
+
+        code = self._codes[key] = len(self.values)
+        self.values.append(value)
+        return code
+
+
+class CommodityTable:
+
+    __slots__ = ('rows', 'valid', 'names', 'categories')
+
+    rows: '_np.ndarray'
+    valid: '_np.ndarray'
+    names: _Tuple[_Optional[L], ...]
+    categories: _Tuple[_Optional[L], ...]
+
+    DTYPE = None if _np is None else _np.dtype(
+        list(COMMODITY_FIELDS) + list(_CODE_FIELDS)
+    )
+
+    # Whether each numeric value of a row was present.
+    VALID_DTYPE = None if _np is None else _np.dtype(
+        [(field, '?') for field, _ in COMMODITY_FIELDS]
+    )
+
+    def __init__(self, rows: '_np.ndarray',
+                 names: _Sequence[_Optional[L]],
+                 categories: _Sequence[_Optional[L]],
+                 valid: _Optional['_np.ndarray'] = None) -> None:
+
+        _require_numpy()
+
+        if valid is None:
+            valid = _np.ones(len(rows), dtype=self.VALID_DTYPE)
+
+        self.rows = rows
+        self.valid = valid
+        self.names = tuple(names)
+        self.categories = tuple(categories)
+
+    @classmethod
+    def from_commodities(
+            cls, commodities: _Iterable[_data.Commodity]
+    ) -> 'CommodityTable':
+
+        _require_numpy()
+
+        names = _Vocabulary()
+        categories = _Vocabulary()
+
+        # noinspection PyProtectedMember
+        records = [
+            tuple(c._data.get(field) for field, _ in COMMODITY_FIELDS)
+            + (names.code(c._data.get('name')),
+               categories.code(c._data.get('category')))
+            for c in commodities
+        ]
+
+        rows, valid = cls._to_rows(records)
+        return cls(rows, names.values, categories.values, valid)
+
+    @classmethod
+    def from_items(
+            cls, items: _Iterable[_Mapping[str, _Any]]
+    ) -> 'CommodityTable':
+
+        # Straight from the "Items" of Market.json, without creating
+        # a Commodity for every row first.
+
+        _require_numpy()
+
+        names = _Vocabulary()
+        categories = _Vocabulary()
+
+        # noinspection PyProtectedMember
+        keys = tuple(_data.Commodity._attrs[field].key
+                     for field, _ in COMMODITY_FIELDS)
+
+        records = [
+            tuple(item.get(key) for key in keys)
+            + (names.code(_localised(item, 'Name')),
+               categories.code(_localised(item, 'Category')))
+            for item in items
+        ]
+
+        rows, valid = cls._to_rows(records)
+        return cls(rows, names.values, categories.values, valid)
+
+    @classmethod
+    def from_market(cls, market: _events.Market) -> 'CommodityTable':
+
+        return cls.from_commodities(market.commodities or ())
+
+    @classmethod
+    def _to_rows(
+            cls, records: _List[_Tuple[_Any, ...]]
+    ) -> _Tuple['_np.ndarray', '_np.ndarray']:
+
+        # None is not representable in the numeric columns, so it is
+        # stored as 0 and masked instead.
+
+        numeric = len(COMMODITY_FIELDS)
+
+        valid = _np.array(
+            [tuple(value is not None for value in record[:numeric])
+             for record in records],
+            dtype=cls.VALID_DTYPE
+        )
+        rows = _np.array(
+            [tuple(0 if value is None else value for value in record)
+             for record in records],
+            dtype=cls.DTYPE
+        )
+
+        return rows, valid
+
+    def __repr__(self) -> str:
+
+        return f"{type(self).__name__}({len(self)} commodities)"
+
+    def __len__(self) -> int:
+
+        return len(self.rows)
+
+    def __iter__(self) -> _Iterator[_data.Commodity]:
+
+        for i in range(len(self.rows)):
+            yield self.commodity(i)
+
+    def __getitem__(
+            self, key: _Union[int, str, slice, '_np.ndarray']
+    ) -> _Union[_data.Commodity, '_np.ndarray', 'CommodityTable']:
+
+        # An index yields a Commodity, a column name its array, and
+        # anything else numpy accepts (slices, masks, index arrays)
+        # a table of the selected rows sharing the interned columns.
+        # Numeric columns come with absent values masked.
+
+        if isinstance(key, str):
+            if key in self.valid.dtype.names:
+                return _np.ma.masked_array(self.rows[key],
+                                           mask=~self.valid[key])
+
+            return self.rows[key]
+
+        if isinstance(key, (int, _np.integer)):
+            return self.commodity(key)
+
+        return type(self)(self.rows[key], self.names, self.categories,
+                          self.valid[key])
+
+    @property
+    def name(self) -> '_np.ndarray':
+
+        return _np.array(self.names, dtype=object)[self.rows['name']]
+
+    @property
+    def category(self) -> '_np.ndarray':
+
+        return _np.array(self.categories, dtype=object)[self.rows['category']]
+
+    def profit(
+            self, other: _Optional['CommodityTable'] = None
+    ) -> '_np.ndarray':
+
+        # Per row, what selling at the other market (or at the galactic
+        # average) earns over buying here. Commodities the other market
+        # does not trade sell for 0; rows lacking a price are masked.
+
+        buy = self.rows['buy_price']
+        missing = ~self.valid['buy_price']
+
+        if other is None:
+            missing |= ~self.valid['mean_price']
+            return _np.ma.masked_array(self.rows['mean_price'] - buy,
+                                       mask=missing)
+
+        if not len(other):
+            return _np.ma.masked_array(-buy, mask=missing)
+
+        order = _np.argsort(other.rows['id'], kind='stable')
+        ids = other.rows['id'][order]
+        prices = other.rows['sell_price'][order]
+        priced = other.valid['sell_price'][order]
+
+        pos = _np.searchsorted(ids, self.rows['id'])
+        pos[pos == len(ids)] = 0
+        found = ids[pos] == self.rows['id']
+
+        return _np.ma.masked_array(_np.where(found, prices[pos], 0) - buy,
+                                   mask=missing | (found & ~priced[pos]))
+
+    def commodity(self, i: int) -> _data.Commodity:
+
+        values = dict(zip(self.rows.dtype.names, self.rows[i].item()))
+
+        values['name'] = self.names[values['name']]
+        values['category'] = self.categories[values['category']]
+
+        for field, valid in zip(self.valid.dtype.names,
+                                self.valid[i].item()):
+            if not valid:
+                del values[field]
+
+        return _data.Commodity(**{k: v for k, v in values.items()
+                                  if v is not None})
+
+
+def _localised(item: _Mapping[str, _Any], key: str) -> _Optional[L]:
+
+    value = item.get(key)
+    if value is None:
+        return None
+
+    return L(value, item.get(key + '_Localised'))
+
+
+# Kinds of archive columns. Numeric ones map straight to a dtype; text
+# and JSON columns hold codes into a vocabulary (-1 for absent values).
+_NUMERIC_KINDS = {bool: '?', int: 'i8', float: 'f8'}
+_K_TIMESTAMP = 'timestamp'
+_K_TEXT = 'text'
+_K_JSON = 'json'
+
+
+def _event_columns(
+        cls: type, path: _Tuple[str, ...] = ()
+) -> _Iterator[_Tuple[str, _Tuple[str, ...], str, _Any]]:
+
+    # (column, attribute path, kind, attribute) for every attribute of
+    # an event class, with nested Data flattened into dotted columns.
+
+    # noinspection PyProtectedMember
+    for name, attr in cls._attrs.items():
+
+        if name == '_event_name':
+            continue
+
+        attr_path = path + (name,)
+        column = '.'.join(attr_path).lstrip('_')
+        type_ = attr.type if isinstance(attr.type, type) else None
+
+        if name == '_timestamp' and not path:
+            yield column, attr_path, _K_TIMESTAMP, attr
+        elif type_ is not None and issubclass(type_, _Data):
+            yield from _event_columns(type_, attr_path)
+        elif type_ is not None and issubclass(type_, L):
+            yield column, attr_path, _K_TEXT, attr
+            yield column + '.localised', attr_path, _K_TEXT, attr
+        elif type_ in _NUMERIC_KINDS:
+            yield column, attr_path, _NUMERIC_KINDS[type_], attr
+        elif type_ is str:
+            yield column, attr_path, _K_TEXT, attr
+        else:
+            yield column, attr_path, _K_JSON, attr
+
+
+def _get(obj: _Data, attr_path: _Tuple[str, ...]) -> _Any:
+
+    # noinspection PyProtectedMember
+    for name in attr_path:
+        obj = obj._data.get(name)
+        if obj is None:
+            return None
+
+    return obj
+
+
+class _NpyColumn:
+
+    # One .npy file written a chunk at a time. Its header is written for
+    # no rows at first and rewritten for the final length on closing.
+
+    __slots__ = ('path', 'kind', 'rows', '_header_size')
+
+    path: _pathlib.Path
+    kind: str
+    rows: int
+
+    _header_size: int
+
+    def __init__(self, path: _pathlib.Path, kind: str) -> None:
+
+        self.path = path
+        self.kind = kind
+        self.rows = 0
+
+        header = _npy_header(kind, 0)
+        self._header_size = len(header)
+        path.write_bytes(header)
+
+    def append(self, data: '_np.ndarray') -> None:
+
+        with open(self.path, 'ab') as f:
+            f.write(_np.ascontiguousarray(data, dtype=self.kind).tobytes())
+
+        self.rows += len(data)
+
+    def chunks(self, size: int) -> _Iterator['_np.ndarray']:
+
+        if not self.rows:
+            return
+
+        data = _np.memmap(self.path, dtype=self.kind, mode='r',
+                          offset=self._header_size, shape=(self.rows,))
+
+        for start in range(0, self.rows, size):
+            yield data[start:start + size]
+
+    def close(self) -> None:
+
+        header = _npy_header(self.kind, self.rows)
+
+        if len(header) == self._header_size:
+            with open(self.path, 'r+b') as f:
+                f.write(header)
+            return
+
+        # Older numpy versions leave no room in the header for the shape
+        # to grow, so the rows are copied behind the new one.
+        part_path = self.path.with_name(self.path.name + '.part')
+
+        with open(self.path, 'rb') as src, open(part_path, 'wb') as dst:
+            dst.write(header)
+            src.seek(self._header_size)
+            _shutil.copyfileobj(src, dst)
+
+        part_path.replace(self.path)
+
+
+def _npy_header(kind: str, rows: int) -> bytes:
+
+    f = _io.BytesIO()
+    _np.lib.format.write_array_header_1_0(f, {
+        'descr': _np.lib.format.dtype_to_descr(_np.dtype(kind)),
+        'fortran_order': False,
+        'shape': (rows,),
+    })
+    return f.getvalue()
+
+
+class _EventCollector:
+
+    # Gathers the column values of one event type and writes them out
+    # every chunk_rows rows: as a row group of <event>.parquet, or
+    # appended to the .npy files in <event>. Only the vocabularies of
+    # text and JSON columns are kept for the whole export.
+
+    CHUNK_ROWS = 65536
+
+    __slots__ = ('event_name', 'rows', 'columns', 'values', 'kinds',
+                 'chunk_rows', '_out_path', '_fmt', '_recoded', '_npy',
+                 '_missing', '_vocabularies', '_writer', '_generation')
+
+    event_name: str
+    rows: int
+    columns: _List[_Tuple[str, _Tuple[str, ...], str, _Any]]
+    values: _Dict[str, _List[_Any]]
+    kinds: _Dict[str, str]
+    chunk_rows: int
+
+    _out_path: _pathlib.Path
+    _fmt: str
+    _recoded: _Set[str]
+    _npy: _Dict[str, _NpyColumn]
+    _missing: _Dict[str, int]
+    _vocabularies: _Dict[str, _Dict[str, int]]
+    _writer: _Optional['_pq.ParquetWriter']
+    _generation: int
+
+    def __init__(self, event_name: str, cls: type, out_path: _pathlib.Path,
+                 fmt: str, chunk_rows: int = CHUNK_ROWS) -> None:
+
+        self.event_name = event_name
+        self.rows = 0
+        self.columns = list(_event_columns(cls))
+        self.values = {column: [] for column, *_ in self.columns}
+        self.values['_unknown'] = []
+
+        # Numeric columns may still turn into JSON ones, should the game
+        # not stick to a type.
+        self.kinds = {column: 'i8' if kind == _K_TIMESTAMP else kind
+                      for column, _, kind, _ in self.columns}
+        self.kinds['_unknown'] = _K_JSON
+
+        self.chunk_rows = chunk_rows
+        self._out_path = out_path
+        self._fmt = fmt
+
+        # Numeric columns turned JSON, whose values are still collected
+        # as they come.
+        self._recoded = set()
+
+        self._npy = {}
+        self._missing = {}
+        self._vocabularies = {}
+        self._writer = None
+        self._generation = 0
+
+    def add(self, event: _events.LogEvent) -> bool:
+
+        # noinspection PyProtectedMember
+        for column, attr_path, kind, attr in self.columns:
+
+            value = _get(event, attr_path)
+
+            if value is None:
+                pass
+            elif kind == _K_TIMESTAMP:
+                value = (value if isinstance(value, _Timestamp)
+                         else value.to_epoch())
+            elif column.endswith('.localised') and isinstance(value, L):
+                value = value.localised
+            elif kind == _K_TEXT:
+                value = str(value)
+            elif kind == _K_JSON:
+                value = _to_json(_types._export(attr.revert, value))
+
+            self.values[column].append(value)
+
+        # noinspection PyProtectedMember
+        self.values['_unknown'].append(
+            _to_json(event._unknown) if event._unknown else None
+        )
+
+        self.rows += 1
+
+        # Whether a chunk is due.
+        return len(self.values['_unknown']) >= self.chunk_rows
+
+    def flush(self) -> None:
+
+        if not self.values['_unknown']:
+            return
+
+        if self._fmt == 'parquet':
+            self._flush_parquet()
+        else:
+            self._flush_npy()
+
+        for values in self.values.values():
+            values.clear()
+
+    def close(self) -> None:
+
+        self.flush()
+
+        if self._fmt == 'parquet':
+            self._close_parquet()
+        else:
+            self._close_npy()
+
+    def _flush_npy(self) -> None:
+
+        path = self._out_path / self.event_name
+        path.mkdir(parents=True, exist_ok=True)
+
+        for column, values in self.values.items():
+
+            kind = self.kinds[column]
+
+            if kind not in (_K_TEXT, _K_JSON):
+                try:
+                    data = _np.array([0 if v is None else v for v in values],
+                                     dtype=kind)
+
+                except (TypeError, ValueError, OverflowError):
+                    self._npy_to_json(column)
+
+                else:
+                    valid = _np.array([v is not None for v in values])
+                    self._npy_file(column, kind).append(data)
+                    self._npy_file(f'{column}.valid', '?').append(valid)
+                    self._missing[column] = (self._missing.get(column, 0)
+                                             + len(valid) - int(valid.sum()))
+                    continue
+
+            if column in self._recoded:
+                values = [None if v is None else _to_json(v) for v in values]
+
+            vocabulary = self._vocabularies.setdefault(column, {})
+            codes = _np.array([-1 if v is None
+                               else vocabulary.setdefault(v, len(vocabulary))
+                               for v in values], dtype='i4')
+
+            self._npy_file(column, 'i4').append(codes)
+
+    def _npy_file(self, name: str, kind: str) -> _NpyColumn:
+
+        try:
+            return self._npy[name]
+
+        except KeyError:
+            pass
+
+        path = self._out_path / self.event_name / f'{name}.npy'
+        npy = self._npy[name] = _NpyColumn(path, kind)
+        return npy
+
+    def _npy_to_json(self, column: str) -> None:
+
+        # The game does not always stick to a type: the rows written so
+        # far are recoded as JSON, just like the ones to come.
+
+        self.kinds[column] = _K_JSON
+        self._recoded.add(column)
+        vocabulary = self._vocabularies[column] = {}
+        self._missing.pop(column, None)
+
+        data = self._npy.pop(column, None)
+        valid = self._npy.pop(f'{column}.valid', None)
+        if data is None:
+            return
+
+        codes = _NpyColumn(data.path.with_name(data.path.name + '.part'),
+                           'i4')
+
+        for values, present in zip(data.chunks(self.chunk_rows),
+                                   valid.chunks(self.chunk_rows)):
+            codes.append(_np.array(
+                [vocabulary.setdefault(_to_json(v), len(vocabulary))
+                 if ok else -1
+                 for v, ok in zip(values.tolist(), present.tolist())],
+                dtype='i4'
+            ))
+
+        valid.path.unlink()
+        codes.path = codes.path.replace(data.path)
+        self._npy[column] = codes
+
+    def _close_npy(self) -> None:
+
+        path = self._out_path / self.event_name
+
+        for npy in self._npy.values():
+            npy.close()
+
+        # Validity is only kept for columns with values missing.
+        for column, missing in self._missing.items():
+            if not missing:
+                (path / f'{column}.valid.npy').unlink()
+
+        for column, vocabulary in self._vocabularies.items():
+            (path / f'{column}.vocab.json').write_text(
+                _json.dumps(list(vocabulary)), encoding='utf-8'
+            )
+
+        (path / 'schema.json').write_text(
+            _json.dumps({'rows': self.rows, 'columns': self.kinds},
+                        indent=1),
+            encoding='utf-8'
+        )
+
+    def _flush_parquet(self) -> None:
+
+        arrays = {}
+
+        for column, values in self.values.items():
+
+            kind = self.kinds[column]
+
+            if kind == '?':
+                pa_type = _pa.bool_()
+            elif kind == 'i8':
+                pa_type = _pa.int64()
+            elif kind == 'f8':
+                pa_type = _pa.float64()
+            else:
+                pa_type = None
+
+            if pa_type is not None:
+                try:
+                    arrays[column] = _pa.array(values, type=pa_type)
+                    continue
+
+                except (TypeError, ValueError, OverflowError,
+                        _pa.ArrowException):
+                    self._parquet_to_json(column)
+
+            if column in self._recoded:
+                values = [None if v is None else _to_json(v) for v in values]
+
+            arrays[column] = _pa.array(values, type=_pa.string())
+
+        table = _pa.table(arrays)
+
+        if self._writer is None:
+            self._writer = _pq.ParquetWriter(self._parquet_part(),
+                                             table.schema)
+
+        self._writer.write_table(table)
+
+    def _parquet_part(self) -> _pathlib.Path:
+
+        return self._out_path / (f'{self.event_name}.parquet'
+                                 f'.{self._generation}.part')
+
+    def _parquet_to_json(self, column: str) -> None:
+
+        # As for .npy files, except that a parquet file cannot be
+        # appended to once closed: the row groups written so far are
+        # copied into a new one.
+
+        self.kinds[column] = _K_JSON
+        self._recoded.add(column)
+
+        if self._writer is None:
+            return
+
+        self._writer.close()
+        old_path = self._parquet_part()
+        self._generation += 1
+
+        with _pq.ParquetFile(old_path) as old:
+
+            i = old.schema_arrow.get_field_index(column)
+            schema = old.schema_arrow.set(i, _pa.field(column, _pa.string()))
+            self._writer = _pq.ParquetWriter(self._parquet_part(), schema)
+
+            for group in range(old.num_row_groups):
+                table = old.read_row_group(group)
+                values = [None if v is None else _to_json(v)
+                          for v in table.column(i).to_pylist()]
+                self._writer.write_table(table.set_column(
+                    i, column, _pa.array(values, type=_pa.string())
+                ))
+
+        old_path.unlink()
+
+    def _close_parquet(self) -> None:
+
+        self._writer.close()
+        self._parquet_part().replace(
+            self._out_path / f'{self.event_name}.parquet'
+        )
+
+
+def _to_json(value: _Any) -> str:
+
+    return _json.dumps(value, separators=(',', ':'), default=str)
+
+
+async def export_archive(
+        journal_path: _Union[str, _os.PathLike],
+        out_path: _Union[str, _os.PathLike],
+        event_names: _Optional[_Iterable[str]] = None,
+        processes: int = 1,
+        fmt: _Optional[str] = None,
+        trusted: bool = False,
+        chunk_rows: int = _EventCollector.CHUNK_ROWS,
+) -> _Dict[str, int]:
+
+    # Writes one columnar file per event type found in the archive:
+    # <out_path>/<event>.parquet when pyarrow is available, otherwise
+    # a directory <out_path>/<event> of .npy columns. Columns are written
+    # out every chunk_rows rows of an event type. Returns the rows written
+    # per event type.
+
+    _require_numpy()
+
+    if fmt is None:
+        fmt = 'npy' if _pa is None else 'parquet'
+
+    if fmt == 'parquet' and _pa is None:
+        raise ImportError("parquet export needs pyarrow")
+
+    if fmt not in ('npy', 'parquet'):
+        raise ValueError(f"unknown format {fmt!r}")
+
+    out_path = _pathlib.Path(out_path)
+    out_path.mkdir(parents=True, exist_ok=True)
+    collectors = {}
+
+    # noinspection PyProtectedMember
+    async for event in _journal.Backfill(_trio.Path(journal_path),
+                                         processes=processes,
+                                         event_names=event_names,
+                                         trusted=trusted):
+        try:
+            collector = collectors[event._event_name]
+
+        except KeyError:
+            collector = collectors[event._event_name] = _EventCollector(
+                event._event_name, type(event), out_path, fmt, chunk_rows
+            )
+
+        if collector.add(event):
+            await _trio.to_thread.run_sync(collector.flush)
+
+    for collector in collectors.values():
+        await _trio.to_thread.run_sync(collector.close)
+
+    return {name: c.rows for name, c in sorted(collectors.items())}
+
+
+class EventColumns(_Mapping[str, '_np.ndarray']):
+
+    # The columns of one exported event type, memory-mapped as they are
+    # first accessed. Absent numeric values come back masked.
+
+    path: _pathlib.Path
+
+    _names: _Tuple[str, ...]
+    _kinds: _Optional[_Dict[str, str]]
+    _rows: int
+    _cache: _Dict[str, '_np.ndarray']
+
+    def __init__(self, out_path: _Union[str, _os.PathLike],
+                 event_name: str) -> None:
+
+        _require_numpy()
+
+        out_path = _pathlib.Path(out_path)
+        parquet_path = out_path / f'{event_name}.parquet'
+
+        if parquet_path.exists():
+            if _pa is None:
+                raise ImportError("parquet columns need pyarrow")
+
+            self.path = parquet_path
+            self._kinds = None
+            metadata = _pq.read_metadata(parquet_path)
+            self._names = tuple(metadata.schema.names)
+            self._rows = metadata.num_rows
+
+        else:
+            self.path = out_path / event_name
+            schema = _json.loads(
+                (self.path / 'schema.json').read_text(encoding='utf-8')
+            )
+            self._kinds = schema['columns']
+            self._names = tuple(self._kinds)
+            self._rows = schema['rows']
+
+        self._cache = {}
+
+    def __repr__(self) -> str:
+
+        return f"{type(self).__name__}({str(self.path)!r})"
+
+    @property
+    def rows(self) -> int:
+
+        return self._rows
+
+    def __len__(self) -> int:
+
+        return len(self._names)
+
+    def __iter__(self) -> _Iterator[str]:
+
+        return iter(self._names)
+
+    def __getitem__(self, column: str) -> '_np.ndarray':
+
+        try:
+            return self._cache[column]
+
+        except KeyError:
+            pass
+
+        if column not in self._names:
+            raise KeyError(column)
+
+        if self._kinds is None:
+            data = self._load_parquet(column)
+        else:
+            data = self._load_npy(column, self._kinds[column])
+
+        self._cache[column] = data
+        return data
+
+    def _load_npy(self, column: str, kind: str) -> '_np.ndarray':
+
+        data = _np.load(self.path / f'{column}.npy', mmap_mode='r')
+
+        if kind in (_K_TEXT, _K_JSON):
+            vocabulary = _json.loads(
+                (self.path / f'{column}.vocab.json').read_text(encoding='utf-8')
+            )
+            return _np.array(vocabulary + [None], dtype=object)[data]
+
+        valid_path = self.path / f'{column}.valid.npy'
+        if valid_path.exists():
+            valid = _np.load(valid_path, mmap_mode='r')
+            return _np.ma.masked_array(data, mask=~valid)
+
+        return data
+
+    def _load_parquet(self, column: str) -> '_np.ndarray':
+
+        table = _pq.read_table(self.path, columns=[column], memory_map=True)
+        chunked = table.column(column)
+
+        if _pa.types.is_string(chunked.type) or not chunked.null_count:
+            return chunked.to_numpy()
+
+        valid = chunked.is_valid().to_numpy()
+        data = chunked.fill_null(False if _pa.types.is_boolean(chunked.type)
+                                 else 0).to_numpy()
+        return _np.ma.masked_array(data, mask=~valid)
@@ -12,21 +12,21 @@ from .types import (
 from .types import Coords, L
 
 
-class Body(_Data):
+class Body(_Data, flyweight=256):
 
     name: str = _Attr(key='Body')
     id: int = _Attr(key='BodyID')
     type: str = _Attr(key='BodyType')
 
 
-class Cargo(_Data):
+class Cargo(_Data, compact=True):
 
     name: L = _Attr()
     count: int = _Attr()
     stolen: int = _Attr()
 
 
-class Commodity(_Data):
+class Commodity(_Data, compact=True):
 
     id: int = _Attr(key='id')
     name: L = _Attr()
@@ -43,13 +43,13 @@ class Commodity(_Data):
     rare: bool = _Attr()
 
 
-class Component(_Data):
+class Component(_Data, compact=True):
 
     name: str = _Attr()
     percent: float = _Attr()
 
 
-class ConflictFaction(_Data):
+class ConflictFaction(_Data, compact=True):
 
     name: str = _Attr()
     stake: str = _Attr()
@@ -64,13 +64,13 @@ class Conflict(_Data):
     faction2: ConflictFaction = _Attr()
 
 
-class Economy(_Data):
+class Economy(_Data, compact=True):
 
     name: L = _Attr()
     proportion: float = _Attr()
 
 
-class Effect(_Data):
+class Effect(_Data, compact=True):
 
     effect: L = _Attr()
     trend: str = _Attr()
@@ -82,7 +82,7 @@ class Engineer(_Data):
     engineer_id: int = _Attr()
 
 
-class EngineeredModifier(_Data):
+class EngineeredModifier(_Data, compact=True):
 
     label: str = _Attr()
     value: float = _Attr()
@@ -115,13 +115,13 @@ class ExplorationData(_Data):
     num_bodies: int = _Attr()
 
 
-class Faction(_Data):
+class Faction(_Data, compact=True, flyweight=256):
 
     name: str = _Attr()
     faction_state: str = _Attr()
 
 
-class Influence(_Data):
+class Influence(_Data, compact=True):
 
     system_address: int = _Attr()
     trend: str = _Attr()
@@ -141,13 +141,13 @@ class FactionEffect(_Data):
     reputation: str = _Attr()
 
 
-class FactionState(_Data):
+class FactionState(_Data, compact=True):
 
     state: str = _Attr()
     trend: int = _Attr()
 
 
-class FactionFull(Faction):
+class FactionFull(Faction, compact=True, flyweight=256):
 
     government: str = _Attr()
     influence: float = _Attr()
@@ -170,7 +170,7 @@ class Market(_Data):
     market_id: int = _Attr()
 
 
-class Material(_Data):
+class Material(_Data, compact=True):
 
     name: L = _Attr()
     category: L = _Attr()
@@ -190,7 +190,7 @@ class Materials(_Data):
     )
 
 
-class Mission(_Data):
+class Mission(_Data, compact=True):
 
     id: int = _Attr(key='MissionID')
     name: str = _Attr()
@@ -225,7 +225,7 @@ class Module(_Data):
     engineering: Engineering = _Attr()
 
 
-class ModulePrice(_Data):
+class ModulePrice(_Data, compact=True):
 
     id: int = _Attr(key='id')
     name: str = _Attr()
@@ -243,20 +243,20 @@ class Ranking(_Data):
 
 
 # TODO: maybe merge Redeem and Reward
-class Redeem(_Data):
+class Redeem(_Data, compact=True):
 
     faction: str = _Attr()
     amount: int = _Attr()
 
 
 # TODO: maybe merge Redeem and Reward
-class Reward(_Data):
+class Reward(_Data, compact=True):
 
     faction: str = _Attr()
     reward: int = _Attr()
 
 
-class Ring(_Data):
+class Ring(_Data, compact=True):
 
     name: str = _Attr()
     ring_class: str = _Attr()
@@ -283,21 +283,21 @@ class Ship(_Data):
     )
 
 
-class ShipPrice(_Data):
+class ShipPrice(_Data, compact=True):
 
     id: int = _Attr(key='id')
     ship_type: L = _Attr()
     ship_price: int = _Attr()
 
 
-class Station(_Data):
+class Station(_Data, flyweight=256):
 
     name: str = _Attr(key='StationName')
     type: str = _Attr(key='StationType')
     carrier_docking_access: str = _Attr()
 
 
-class StationFull(Station):
+class StationFull(Station, flyweight=256):
 
     faction: Faction = _Attr(key='StationFaction')
     government: L = _Attr(key='StationGovernment')
@@ -328,7 +328,7 @@ class Statistics(_Data):
     cqc: dict[str, int] = _Attr()
 
 
-class StoredModule(_Data):
+class StoredModule(_Data, compact=True):
 
     name: L = _Attr()
     storage_slot: int = _Attr()
@@ -341,7 +341,7 @@ class StoredModule(_Data):
     hot: bool = _Attr()
 
 
-class StoredShip(_Data):
+class StoredShip(_Data, compact=True):
 
     ship_id: int = _Attr()
     ship_type: L = _Attr()
@@ -355,7 +355,7 @@ class StoredShip(_Data):
     hot: bool = _Attr()
 
 
-class System(_Data):
+class System(_Data, flyweight=256):
 
     star_system: str = _Attr()
     system_address: int = _Attr()
@@ -368,7 +368,7 @@ class System(_Data):
     star_class: str = _Attr()
 
 
-class SystemFull(System):
+class SystemFull(System, flyweight=256):
 
     allegiance: str = _Attr(key='SystemAllegiance')
     economy: L = _Attr(key='SystemEconomy')
@@ -12,6 +12,7 @@ from .types import (
     Coords as _Coords,
     Data as _Data,
     DateTime as _DateTime,
+    Timestamp as _Timestamp,
     L,
 )
 
@@ -42,6 +43,16 @@ class Event(_Data):
                 default=event_name, precheck=lambda x: x == event_name,
             )
 
+        if kwargs.pop('epoch_timestamp', False):
+            # noinspection PyTypeChecker
+            cls._timestamp = _Attr(
+                name='_timestamp', type_=_Timestamp, key='timestamp',
+                param=None,
+                default_factory=_Timestamp.now,
+                convert=_Timestamp.from_elite_string,
+                revert=lambda ts, _: ts.to_elite_string(),
+            )
+
         super().__init_subclass__(**kwargs)
 
     def __eq__(self, other) -> bool:
@@ -0,0 +1,338 @@
+#!/usr/bin/env python3
+
+from typing import (
+    Any as _Any,
+    BinaryIO as _BinaryIO,
+    Dict as _Dict,
+    Iterator as _Iterator,
+    List as _List,
+    Optional as _Optional,
+    Tuple as _Tuple,
+    Union as _Union,
+)
+
+import hashlib as _hashlib
+import io as _io
+import os as _os
+import pathlib as _pathlib
+import sqlite3 as _sqlite3
+
+from . import (
+    events as _events,
+    types as _types,
+)
+
+from .journal import (
+    _Journal,
+    _LogFile,
+    _open_log,
+    _select_logs,
+)
+
+from .logging import Logger as _Logger
+
+
+_log = _Logger(__name__)
+
+
+_SCHEMA = '''
+CREATE TABLE IF NOT EXISTS files (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    path TEXT NOT NULL,
+    fingerprint TEXT NOT NULL,
+    offset INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS events (
+    timestamp INTEGER NOT NULL,
+    event TEXT NOT NULL,
+    file INTEGER NOT NULL REFERENCES files (id),
+    offset INTEGER NOT NULL,
+    length INTEGER NOT NULL,
+    system_address INTEGER,
+    market_id INTEGER
+);
+CREATE INDEX IF NOT EXISTS events_by_name ON events (event, timestamp);
+CREATE INDEX IF NOT EXISTS events_by_time ON events (timestamp);
+CREATE INDEX IF NOT EXISTS events_by_system ON events (system_address)
+    WHERE system_address IS NOT NULL;
+CREATE INDEX IF NOT EXISTS events_by_market ON events (market_id)
+    WHERE market_id IS NOT NULL;
+'''
+
+_Time = _Union[int, str, _types.DateTime]
+
+
+class EventIndex:
+
+    # Where each line of the journal archive is, along with a few keys
+    # worth searching by, so queries read just the matching lines.
+
+    # Column and journal key of the searchable fields.
+    KEYS: _Tuple[_Tuple[str, str], ...] = (
+        ('system_address', 'SystemAddress'),
+        ('market_id', 'MarketID'),
+    )
+
+    BATCH_SIZE = 1000
+
+    journal_path: _pathlib.Path
+    path: _pathlib.Path
+    lines: int
+    invalid: int
+
+    _db: _sqlite3.Connection
+    _journal: _Journal
+
+    def __init__(self, journal_path: _Union[str, _os.PathLike],
+                 path: _Union[str, _os.PathLike],
+                 trusted: bool = False) -> None:
+
+        self.journal_path = _pathlib.Path(journal_path)
+        self.path = _pathlib.Path(path)
+        self.lines = 0
+        self.invalid = 0
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        # Used from whichever worker thread trio.to_thread picks, though
+        # never from two at once.
+        self._db = _sqlite3.connect(self.path, check_same_thread=False)
+        self._db.execute('PRAGMA journal_mode=WAL')
+        self._db.execute('PRAGMA synchronous=NORMAL')
+        self._db.executescript(_SCHEMA)
+
+        self._journal = _Journal(trusted=trusted)
+
+    def __repr__(self) -> str:
+
+        return f"{type(self).__name__}({str(self.path)!r})"
+
+    def __enter__(self) -> 'EventIndex':
+
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+
+        self.close()
+
+    def close(self) -> None:
+
+        self._db.close()
+
+    def update(self) -> int:
+
+        # Indexes whatever was appended since the last update, including
+        # new files. Returns the number of lines added.
+
+        log_files = _select_logs(
+            self.journal_path.glob('Journal.*.*.log*')
+        )
+
+        lines = self.lines
+
+        for log_file in log_files:
+            self._update_file(log_file)
+
+        return self.lines - lines
+
+    # noinspection PyProtectedMember
+    def _update_file(self, log_file: _LogFile) -> None:
+
+        # Files are known by their name without a compression suffix, and
+        # offsets count decompressed bytes, so compressing a log that is
+        # already indexed merely changes its path.
+
+        path = _pathlib.Path(log_file.path)
+        name = path.name[:len(path.name) - len(log_file.name_data.suffix)]
+
+        row = self._db.execute(
+            'SELECT id, path, fingerprint, offset FROM files WHERE name = ?',
+            (name,)
+        ).fetchone()
+
+        if row and row[1] == path.name and (
+                log_file.compressed or path.stat().st_size == row[3]
+        ):
+            return
+
+        with _open_log(str(path)) as f:
+
+            header = f.readline()
+            if not header.endswith(b'\x0a'):
+                return
+
+            fingerprint = _hashlib.blake2b(header, digest_size=8).hexdigest()
+
+            with self._db:
+
+                if row and row[2] == fingerprint:
+                    file_id, offset = row[0], row[3]
+
+                    if row[1] != path.name:
+                        self._db.execute(
+                            'UPDATE files SET path = ? WHERE id = ?',
+                            (path.name, file_id)
+                        )
+
+                else:
+                    if row:
+                        _log.info("reindexing replaced {}", path.name)
+                        self._db.execute('DELETE FROM events WHERE file = ?',
+                                         (row[0],))
+                        self._db.execute('DELETE FROM files WHERE id = ?',
+                                         (row[0],))
+
+                    file_id = self._db.execute(
+                        'INSERT INTO files (name, path, fingerprint, offset)'
+                        ' VALUES (?, ?, ?, ?)',
+                        (name, path.name, fingerprint, f.tell())
+                    ).lastrowid
+                    offset = f.tell()
+
+                f.seek(offset)
+                batch = []
+
+                for line in f:
+
+                    # The game may still be writing this one.
+                    if not line.endswith(b'\x0a'):
+                        break
+
+                    # Skipped rather than holding up everything after it.
+                    try:
+                        data = self._journal._decode_line(line)
+                        timestamp = _types.Timestamp.from_elite_string(
+                            data['timestamp']
+                        )
+
+                    except (ValueError, KeyError, TypeError) as exc:
+                        _log.warning("skipping line at offset {} of {}: {!r}",
+                                     offset, path.name, exc)
+                        self.invalid += 1
+                        offset += len(line)
+                        continue
+
+                    batch.append(
+                        (timestamp, data.get('event'), file_id, offset,
+                         len(line))
+                        + tuple(data.get(key) for _, key in self.KEYS)
+                    )
+                    offset += len(line)
+
+                    if len(batch) >= self.BATCH_SIZE:
+                        self._insert(batch)
+
+                self._insert(batch)
+
+                self._db.execute('UPDATE files SET offset = ? WHERE id = ?',
+                                 (offset, file_id))
+
+    def _insert(self, batch: _List[_Tuple[_Any, ...]]) -> None:
+
+        columns = ', '.join(column for column, _ in self.KEYS)
+        placeholders = ', '.join('?' * len(self.KEYS))
+
+        self._db.executemany(
+            f'INSERT INTO events (timestamp, event, file, offset, length,'
+            f' {columns}) VALUES (?, ?, ?, ?, ?, {placeholders})',
+            batch
+        )
+
+        self.lines += len(batch)
+        batch.clear()
+
+    def query(self, event_name: _Optional[str] = None, *,
+              since: _Optional[_Time] = None,
+              until: _Optional[_Time] = None,
+              limit: _Optional[int] = None,
+              **keys: _Any) -> _Iterator[_events.LogEvent]:
+
+        # Events in the order they were logged, optionally restricted
+        # to a name, a half-open time range and values of KEYS columns.
+
+        locations = self.locate(event_name, since=since, until=until,
+                                limit=limit, **keys)
+
+        files = {}
+
+        try:
+            for name, offset, length in locations:
+                yield self._read(files, name, offset, length)
+
+        finally:
+            for f in files.values():
+                f.close()
+
+    def locate(self, event_name: _Optional[str] = None, *,
+               since: _Optional[_Time] = None,
+               until: _Optional[_Time] = None,
+               limit: _Optional[int] = None,
+               **keys: _Any) -> _List[_Tuple[str, int, int]]:
+
+        columns = dict(self.KEYS)
+        conditions = []
+        params = []
+
+        if event_name is not None:
+            conditions.append('event = ?')
+            params.append(event_name)
+
+        if since is not None:
+            conditions.append('timestamp >= ?')
+            params.append(_to_epoch(since))
+
+        if until is not None:
+            conditions.append('timestamp < ?')
+            params.append(_to_epoch(until))
+
+        for column, value in keys.items():
+            if column not in columns:
+                raise TypeError(f"cannot query by {column!r}")
+
+            conditions.append(f'{column} = ?')
+            params.append(value)
+
+        sql = ('SELECT files.path, events.offset, events.length'
+               ' FROM events JOIN files ON events.file = files.id')
+        if conditions:
+            sql += ' WHERE ' + ' AND '.join(conditions)
+        sql += ' ORDER BY timestamp, files.name, events.offset'
+        if limit is not None:
+            sql += ' LIMIT ?'
+            params.append(limit)
+
+        return self._db.execute(sql, params).fetchall()
+
+    # noinspection PyProtectedMember
+    def _read(self, files: _Dict[str, _BinaryIO], name: str, offset: int,
+              length: int) -> _events.LogEvent:
+
+        try:
+            f = files[name]
+
+        except KeyError:
+            f = files[name] = _open_log(str(self.journal_path / name))
+
+        try:
+            f.seek(offset)
+
+        except _io.UnsupportedOperation:
+            # A decompressed stream that can only go forward.
+            f.close()
+            f = files[name] = _open_log(str(self.journal_path / name))
+            f.seek(offset)
+        data = self._journal._decode_line(f.read(length))
+
+        return self._journal._make_event(data.get('event'), data)
+
+
+def _to_epoch(value: _Time) -> int:
+
+    if isinstance(value, str):
+        return _types.Timestamp.from_elite_string(value)
+
+    if isinstance(value, _types.DateTime):
+        return value.to_epoch()
+
+    return int(value)
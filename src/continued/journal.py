@@ -1,14 +1,33 @@
 #!/usr/bin/env python3
 
-from typing import Any, Deque, Dict, Optional, Set, Type, Union
+from typing import (
+    Any, AsyncIterable, AsyncIterator, Collection, Dict, FrozenSet, Iterable,
+    List, Optional, Set, Tuple, Type, Union,
+)
 
+import concurrent.futures
+import ctypes
 import dataclasses
+import errno
+import bisect
+import bz2
+import gzip
+import hashlib
+import heapq
+import io
+import itertools
 import json
+import lzma
+import math
 import os
 import pathlib
 import re
+import struct
+import sys
+import time
 
 from collections import deque
+from contextlib import aclosing, asynccontextmanager
 from contextvars import ContextVar
 from functools import total_ordering
 
@@ -16,7 +35,18 @@ import trio
 import trio_asyncio
 import watchgod
 
+try:
+    from compression import zstd as _zstd
+
+except ImportError:
+    try:
+        import zstandard as _zstd
+
+    except ImportError:
+        _zstd = None
+
 from . import (
+    _json,
     events as _events,
     data as _data,
     types as _types,
@@ -31,28 +61,73 @@ _log = _Logger(__name__)
 EventMap = ContextVar('event_map')
 
 
+_DATA_FILES = (
+    (_events.Cargo, 'Cargo.json'),
+    (_events.Market, 'Market.json'),
+    (_events.ModuleInfo, 'ModulesInfo.json'),
+    (_events.NavRoute, 'NavRoute.json'),
+    (_events.Outfitting, 'Outfitting.json'),
+    (_events.Shipyard, 'Shipyard.json'),
+    (_events.Status, 'Status.json'),
+)
+
+# Data files rewritten so often that only their freshest snapshot matters.
+_LATEST_ONLY = frozenset({_events.Status})
+
+
 class _JournalWatcher(watchgod.watcher.AllWatcher):
 
+    # Directory timestamps can be coarse, so a file created within this
+    # many nanoseconds of the last directory change could otherwise be
+    # missed; rescan as long as the directory has changed that recently.
+    SETTLE_NS = 2_000_000_000
+
+    _dir_mtime: Optional[int]
+    _active_log: Optional[str]
+
     def __init__(self, root_path: trio.Path) -> None:
 
+        self._dir_mtime = None
+        self._active_log = None
+
         super().__init__(pathlib.Path(root_path))
 
     def _walk(self, path: str, changes: Set['watchgod.watcher.FileChange'],
               new_files: Dict[str, float]) -> None:
 
-        for entry in os.scandir(path):
-            if entry.is_dir():
-                continue
+        dir_mtime = os.stat(path).st_mtime_ns
+        if (dir_mtime != self._dir_mtime
+                or time.time_ns() - dir_mtime < self.SETTLE_NS):
+            self._dir_mtime = dir_mtime
+            self._active_log = self._find_active_log(path)
 
-            if entry.name.endswith('.json'):
-                self._watch_file(entry.path, changes, new_files, entry.stat())
-                continue
+        for _, file_name in _DATA_FILES:
+            file_path = os.path.join(path, file_name)
+            try:
+                self._watch_file(file_path, changes, new_files,
+                                 os.stat(file_path))
 
-            if not entry.name.endswith('.log'):
-                continue
+            except FileNotFoundError:
+                pass
 
-            self._watch_file(entry.path, changes, new_files,
-                             os.stat(entry.path))
+        if self._active_log:
+            try:
+                self._watch_file(self._active_log, changes, new_files,
+                                 os.stat(self._active_log))
+
+            except FileNotFoundError:
+                self._active_log = None
+
+    @staticmethod
+    def _find_active_log(path: str) -> Optional[str]:
+
+        log_file = max(filter(
+            (lambda log_file: log_file and not log_file.name_data.tag),
+            (_LogFile(entry.path) for entry in os.scandir(path)
+             if entry.name.endswith('.log'))
+        ), default=None)
+
+        return os.fspath(log_file.path) if log_file else None
 
     def should_watch_dir(self, entry: 'watchgod.watcher.DirEntry') -> bool:
         return False
@@ -61,6 +136,118 @@ class _JournalWatcher(watchgod.watcher.AllWatcher):
         return entry.name.rsplit('.', maxsplit=1)[-1] in ('json', 'log')
 
 
+class _InotifyWatcher:
+
+    IN_MODIFY = 0x00000002
+    IN_CLOSE_WRITE = 0x00000008
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+    IN_Q_OVERFLOW = 0x00004000
+
+    MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE
+
+    _EVENT = struct.Struct('iIII')
+
+    root_path: str
+
+    _fd: int
+
+    def __init__(self, root_path: trio.Path) -> None:
+
+        if not sys.platform.startswith('linux'):
+            raise OSError(errno.ENOSYS, "inotify is only available on Linux")
+
+        self.root_path = os.fspath(root_path)
+
+        libc = ctypes.CDLL(None, use_errno=True)
+
+        self._fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, os.strerror(err))
+
+        wd = libc.inotify_add_watch(self._fd, os.fsencode(self.root_path),
+                                    self.MASK)
+        if wd < 0:
+            err = ctypes.get_errno()
+            os.close(self._fd)
+            raise OSError(err, os.strerror(err), self.root_path)
+
+    def __repr__(self) -> str:
+
+        return f"{type(self).__name__}({self.root_path!r})"
+
+    def __enter__(self) -> '_InotifyWatcher':
+
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+
+        self.close()
+
+    def close(self) -> None:
+
+        if self._fd >= 0:
+            trio.lowlevel.notify_closing(self._fd)
+            os.close(self._fd)
+            self._fd = -1
+
+    def __aiter__(self) -> '_InotifyWatcher':
+
+        return self
+
+    async def __anext__(self) -> Set['watchgod.watcher.FileChange']:
+
+        while True:
+            await trio.lowlevel.wait_readable(self._fd)
+
+            changes = set()
+
+            while True:
+                try:
+                    buffer = os.read(self._fd, 1 << 16)
+
+                except BlockingIOError:
+                    break
+
+                self._parse(buffer, changes)
+
+            if changes:
+                return changes
+
+    def _parse(self, buffer: bytes,
+               changes: Set['watchgod.watcher.FileChange']) -> None:
+
+        offset = 0
+
+        while offset < len(buffer):
+            _, mask, _, length = self._EVENT.unpack_from(buffer, offset)
+            offset += self._EVENT.size
+
+            name = buffer[offset:offset + length].rstrip(b'\x00')
+            offset += length
+
+            if mask & self.IN_Q_OVERFLOW:
+                _log.warning("inotify queue overflow in {}", self.root_path)
+                self._rescan(changes)
+                continue
+
+            name = os.fsdecode(name)
+            if not name.endswith(('.json', '.log')):
+                continue
+
+            change = (watchgod.Change.added
+                      if mask & (self.IN_CREATE | self.IN_MOVED_TO)
+                      else watchgod.Change.modified)
+            changes.add((change, os.path.join(self.root_path, name)))
+
+    def _rescan(self, changes: Set['watchgod.watcher.FileChange']) -> None:
+
+        for entry in os.scandir(self.root_path):
+            if entry.name.endswith(('.json', '.log')):
+                changes.add((watchgod.Change.modified, entry.path))
+
+
 @total_ordering
 class _LogFile:
 
@@ -82,6 +269,10 @@ class _LogFile:
     path: trio.Path
     name_data: Optional[NameData]
 
+    # Read size for compressed logs, which are decompressed in a worker
+    # thread, so fewer and larger reads pay off.
+    DECOMPRESSED_CHUNK_SIZE = 1 << 20
+
     FMT_FILENAME = ('Journal{tag}.'
                     '{year:02}{month:02}{day:02}'
                     '{hour:02}{minute:02}{second:02}'
@@ -168,48 +359,448 @@ class _LogFile:
 
         return self.name_data < other.name_data
 
+    @property
+    def compressed(self) -> bool:
+
+        return bool(self.name_data and self.name_data.suffix)
+
+    @property
+    def chunk_size(self) -> int:
+
+        if self.compressed:
+            return self.DECOMPRESSED_CHUNK_SIZE
+
+        return _LineReader.CHUNK_SIZE
+
+    def is_same_log(self, other: '_LogFile') -> bool:
+
+        # Whether compressed or not.
+        return (self.path.parent == other.path.parent
+                and self.name_data is not None
+                and other.name_data is not None
+                and self.name_data.replace(suffix='') ==
+                other.name_data.replace(suffix=''))
+
     # noinspection PyUnresolvedReferences,PyProtectedMember
     async def open(self, **kwargs) -> trio._file_io.AsyncIOWrapper:
 
-        return await self.path.open(**kwargs)
+        if not self.compressed:
+            return await self.path.open(**kwargs)
+
+        if kwargs.get('mode', 'r') != 'rb':
+            raise ValueError("compressed journal logs open in 'rb' mode only")
+
+        return trio.wrap_file(
+            await trio.to_thread.run_sync(_open_log, os.fspath(self.path))
+        )
 
     async def stat(self):
 
         return await self.path.stat()
 
 
+def _open_zstd(path: str, mode: str = 'rb') -> io.BufferedIOBase:
+
+    if _zstd is None:
+        raise ImportError("reading .zst journal logs needs zstandard")
+
+    return _zstd.open(path, mode=mode)
+
+
+class _DecompressedReader(io.BufferedReader):
+
+    # Not every decompressing stream can seek (zstandard's cannot at
+    # all), so seeking forward reads and discards instead. Seeking
+    # backward is left to the stream and may well be unsupported.
+
+    def seekable(self) -> bool:
+
+        return True
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+
+        position = self.tell()
+
+        if whence == io.SEEK_CUR:
+            offset += position
+        elif whence != io.SEEK_SET:
+            raise io.UnsupportedOperation("can only seek from the start")
+
+        if offset < position:
+            try:
+                return super().seek(offset)
+
+            except OSError as exc:
+                raise io.UnsupportedOperation(
+                    "cannot seek backward in a decompressed stream"
+                ) from exc
+
+        while position < offset:
+            chunk = self.read(min(offset - position,
+                                  _LogFile.DECOMPRESSED_CHUNK_SIZE))
+            if not chunk:
+                break
+
+            position += len(chunk)
+
+        return position
+
+
+_DECOMPRESSORS = {
+    '.gz': gzip.open,
+    '.bz2': bz2.open,
+    '.xz': lzma.open,
+    '.zst': _open_zstd,
+}
+
+
+def _open_log(path: str) -> io.BufferedIOBase:
+
+    # A journal log for reading bytes, decompressing as its suffix says.
+
+    log_file = _LogFile(path)
+    if not log_file.compressed:
+        return open(path, mode='rb')
+
+    suffix = log_file.name_data.suffix.lower()
+
+    try:
+        decompressor = _DECOMPRESSORS[suffix]
+
+    except KeyError:
+        raise ValueError(f"unsupported journal compression {suffix}")
+
+    return _DecompressedReader(decompressor(path, mode='rb'),
+                               buffer_size=_LogFile.DECOMPRESSED_CHUNK_SIZE)
+
+
+def _select_logs(paths: Iterable[Any]) -> List[_LogFile]:
+
+    # The untagged journal logs among the paths, in order. A log present
+    # both plain and compressed is taken plain, as the compressed file
+    # may not be complete yet.
+
+    log_files = {}
+
+    for log_file in map(_LogFile, paths):
+
+        if not log_file or log_file.name_data.tag:
+            continue
+
+        if (log_file.compressed and
+                log_file.name_data.suffix.lower() not in _DECOMPRESSORS):
+            continue
+
+        key = log_file.name_data.replace(suffix='')
+        if key not in log_files or not log_file.compressed:
+            log_files[key] = log_file
+
+    return sorted(log_files.values())
+
+
+class _LineReader:
+
+    CHUNK_SIZE = 1 << 16
+
+    reads: int
+    lines: int
+    offset: int
+
+    # noinspection PyUnresolvedReferences,PyProtectedMember
+    def __init__(self, f: trio._file_io.AsyncIOWrapper,
+                 chunk_size: int = CHUNK_SIZE) -> None:
+
+        self._f = f
+        self._chunk_size = chunk_size
+        self._lines = deque()
+        self._partial = b''
+
+        self.reads = 0
+        self.lines = 0
+        self.offset = 0
+
+    def __aiter__(self) -> '_LineReader':
+
+        return self
+
+    async def __anext__(self) -> bytes:
+
+        line = await self.readline()
+        if not line:
+            raise StopAsyncIteration
+
+        return line
+
+    async def readline(self) -> bytes:
+
+        while not self._lines:
+            if not await self._fill():
+                return b''
+
+        line = self._lines.popleft()
+        self.lines += 1
+        self.offset += len(line)
+
+        return line
+
+    async def seek(self, offset: int) -> None:
+
+        await self._f.seek(offset)
+
+        self._lines.clear()
+        self._partial = b''
+        self.offset = offset
+
+    async def _fill(self) -> bool:
+
+        chunk = await self._f.read(self._chunk_size)
+        self.reads += 1
+
+        if not chunk:
+            return False
+
+        *lines, self._partial = (self._partial + chunk).split(b'\x0a')
+        self._lines.extend(line + b'\x0a' for line in lines)
+
+        return True
+
+
+class _Checkpoints:
+
+    @dataclasses.dataclass(frozen=True)
+    class Entry:
+        offset: int
+        fingerprint: str
+        timestamp: Optional[str] = None
+
+    path: trio.Path
+    keep: int
+
+    _entries: Dict[str, Entry]
+
+    def __init__(self, path: trio.Path, keep: int = 16) -> None:
+
+        self.path = trio.Path(path)
+        self.keep = keep
+
+        self._entries = {}
+
+    def __repr__(self) -> str:
+
+        return f"{type(self).__name__}({self.path!r})"
+
+    def get(self, log_file: _LogFile) -> Optional[Entry]:
+
+        return self._entries.get(log_file.path.name)
+
+    def update(self, log_file: _LogFile, offset: int, fingerprint: str,
+               timestamp: Optional[_types.DateTime] = None) -> None:
+
+        self._entries[log_file.path.name] = self.Entry(
+            offset=offset,
+            fingerprint=fingerprint,
+            timestamp=timestamp.to_elite_string() if timestamp else None,
+        )
+
+        for name in sorted(self._entries)[:-self.keep]:
+            del self._entries[name]
+
+    async def load(self) -> None:
+
+        try:
+            data = json.loads(await self.path.read_text(encoding='utf-8'))
+            entries = {name: self.Entry(**entry)
+                       for name, entry in data.items()}
+
+        except FileNotFoundError:
+            return
+
+        # Not JSON, or not shaped like what save() writes.
+        except (ValueError, TypeError, AttributeError) as exc:
+            _log.warning("discarding checkpoints in {}: {}", self.path, exc)
+            return
+
+        self._entries = entries
+
+    async def save(self) -> None:
+
+        data = {name: dataclasses.asdict(entry)
+                for name, entry in self._entries.items()}
+
+        await self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        temp_path = self.path.with_name(self.path.name + '.tmp')
+        await temp_path.write_text(json.dumps(data, indent=1),
+                                   encoding='utf-8')
+        await temp_path.replace(self.path)
+
+
+@dataclasses.dataclass
+class _Pending:
+
+    # An event on its way through the reorder window, or with event None
+    # a checkpoint marker. The offset is that of the line following it.
+    # Markers with save set have their checkpoint saved unthrottled.
+
+    event: Optional[_events.LogEvent]
+    offset: int
+    save: bool = False
+    ready: trio.Event = dataclasses.field(default_factory=trio.Event)
+    ready_at: float = 0.0
+
+    def set_ready(self) -> None:
+
+        self.ready_at = trio.current_time()
+        self.ready.set()
+
+
+class _LogChanges:
+
+    # Change notifications for the journal logs, folded like those of
+    # _DataFile: at most one is pending, and waiting for it yields the
+    # newest log notified so far. The reader may be stalled for a while
+    # behind the reorder window, so notifying must never block.
+
+    coalesced: int
+
+    _path: Optional[trio.Path]
+    _notify: trio.MemorySendChannel
+    _notified: trio.MemoryReceiveChannel
+
+    def __init__(self) -> None:
+
+        self.coalesced = 0
+
+        self._path = None
+        self._notify, self._notified = trio.open_memory_channel(1)
+
+    def __repr__(self) -> str:
+
+        return f"{type(self).__name__}({self._path!r})"
+
+    def notify(self, path: trio.Path) -> None:
+
+        if self._path is None or _LogFile(self._path) < _LogFile(path):
+            self._path = trio.Path(path)
+
+        try:
+            self._notify.send_nowait(None)
+
+        except trio.WouldBlock:
+            self.coalesced += 1
+
+    async def wait(self) -> trio.Path:
+
+        await self._notified.receive()
+        return self._path
+
+
 class _Journal:
 
-    _decoder: json.JSONDecoder
+    ALWAYS_HANDLED = frozenset({'Continued', 'Fileheader', 'Shutdown'})
 
-    log_file: Optional[_LogFile]
+    RE_EVENT = re.compile(rb'"event"\s*:\s*"([^"\\]*)"')
 
+    # Checkpoints are saved once this many seconds have passed or bytes
+    # have been read since the last save, and on Continued and Shutdown.
+    CHECKPOINT_INTERVAL = 5.0
+    CHECKPOINT_BYTES = 1 << 20
+
+    checkpoints: Optional[_Checkpoints]
+    lazy: bool
+    trusted: bool
+    log_file: Optional[_LogFile]
+    skipped: int
+    reorder_window: int
+
+    emitted: int
+    hol_delay: float
+    hol_delay_max: float
+
+    _wanted: Optional[Set[bytes]]
+    _enriching: Dict[str, _Pending]
+    _in_flight: int
+    _shut_down: bool
+    _unsaved: Optional[int]
+    _saved_at: float
+
+    fingerprint: Optional[str]
+    last_timestamp: Optional[_types.DateTime]
     timestamp: Optional[_types.DateTime]
     part: Optional[int]
     language: Optional[str]
     game_version = Optional[str]
     build = Optional[str]
 
-    def __init__(self) -> None:
-
-        self._decoder = json.JSONDecoder(strict=True)
+    def __init__(self, checkpoints: Optional[_Checkpoints] = None,
+                 lazy: bool = False,
+                 event_names: Optional[Collection[str]] = None,
+                 trusted: bool = False, reorder_window: int = 64) -> None:
 
+        self.checkpoints = checkpoints
+        self.lazy = lazy
+        self.trusted = trusted
         self.log_file = None
-
+        self.skipped = 0
+        self.reorder_window = reorder_window
+
+        # Events handled, and the time they spent ready but held back
+        # behind an earlier event still waiting for its side file.
+        self.emitted = 0
+        self.hol_delay = 0.0
+        self.hol_delay_max = 0.0
+
+        self._enriching = {}
+        self._in_flight = 0
+        self._shut_down = False
+
+        # Bytes read past the saved checkpoints, None with nothing
+        # left to save.
+        self._unsaved = None
+        self._saved_at = -math.inf
+
+        self._wanted = None
+        if event_names is not None:
+            self.subscribe(*event_names)
+
+        self.fingerprint = None
+        self.last_timestamp = None
         self.timestamp = None
         self.part = None
         self.language = None
         self.game_version = None
         self.build = None
 
-    # noinspection PyUnresolvedReferences,PyProtectedMember
-    async def _parse_header(self, f: trio._file_io.AsyncIOWrapper) -> None:
+    def subscribe(self, *event_names: str) -> None:
+
+        if self._wanted is None:
+            self._wanted = {name.encode('utf-8')
+                            for name in self.ALWAYS_HANDLED}
+
+        self._wanted.update(name.encode('utf-8') for name in event_names)
+
+    def _wants(self, line: bytes) -> bool:
+
+        if self._wanted is None:
+            return True
+
+        m = self.RE_EVENT.search(line)
+        if not m or m[1] in self._wanted:
+            return True
+
+        self.skipped += 1
+        return False
+
+    async def _parse_header(self, f: _LineReader) -> None:
 
         header = await f.readline()
         if not header.endswith(b'\x0a'):
             raise ValueError("invalid header")
 
-        header = self._decoder.decode(header.decode('utf-8'))
+        self.fingerprint = hashlib.blake2b(header, digest_size=8).hexdigest()
+        self.last_timestamp = None
+
+        header = _json.decode(header)
 
         if header.get('event') != 'Fileheader':
             raise ValueError("invalid header")
@@ -230,6 +821,11 @@ class _Journal:
         self.game_version = header.get('gameversion')
         self.build = header.get('build')
 
+    @staticmethod
+    async def find_logs(journal_path: trio.Path) -> List[_LogFile]:
+
+        return _select_logs(await journal_path.glob('Journal.*.*.log*'))
+
     async def find_initial_log(self, journal_path: trio.Path) -> None:
 
         candidates = await journal_path.glob('Journal.*.*.log')
@@ -237,66 +833,262 @@ class _Journal:
 
         self.log_file = max(candidates, default=None)
 
-    async def async_loop(self,
-                         file_modified: trio.MemoryReceiveChannel) -> None:
-
-        async with file_modified:
+    async def async_loop(self, log_changes: _LogChanges) -> None:
 
+        try:
             while True:
 
                 while not self.log_file:
 
-                    path = await file_modified.receive()
+                    path = await log_changes.wait()
                     self.log_file = _LogFile(path)
 
                 async with await self.log_file.open(mode='rb') as f:
 
-                    await self._handle_file(f, file_modified)
+                    await self._handle_file(
+                        _LineReader(f, self.log_file.chunk_size),
+                        log_changes
+                    )
 
-    # noinspection PyUnresolvedReferences,PyProtectedMember
-    async def _handle_file(self, f: trio._file_io.AsyncIOWrapper,
-                           file_modified: trio.MemoryReceiveChannel) -> None:
+        finally:
+            with trio.CancelScope(shield=True):
+                await self._save_checkpoints()
 
-        event_map = EventMap.get()
+    async def _handle_file(self, f: _LineReader,
+                           log_changes: _LogChanges) -> None:
 
         await self._parse_header(f)
+        await self._resume(f)
+
+        # Decoding runs up to reorder_window events ahead of handling, so
+        # an event waiting for its side file no longer stalls the lines
+        # after it. Events are still handled in the order they were logged.
+
+        self._enriching = {}
+        self._in_flight = 0
+        self._shut_down = False
+
+        async with trio.open_nursery() as nursery:
+
+            send, recv = trio.open_memory_channel(self.reorder_window)
+            nursery.start_soon(self._emit_events, recv, nursery.cancel_scope)
+
+            async with send:
+                next_log = await self._read_events(f, log_changes,
+                                                   send, nursery)
+
+        self.log_file = None if self._shut_down else next_log
+
+    async def _read_events(self, f: _LineReader,
+                           log_changes: _LogChanges,
+                           pending_events: trio.MemorySendChannel,
+                           nursery: trio.Nursery) -> Optional[_LogFile]:
+
+        event_map = EventMap.get()
+        next_log = None
 
         while True:
             async for line in f:
                 assert line.endswith(b'\x0a')
 
-                data = self._decoder.decode(line.decode('utf-8'))
+                if not self._wants(line):
+                    continue
+
+                data = self._decode_line(line)
                 event_name = data.get('event')
                 if event_name == 'Continued':
+                    marker = _Pending(None, f.offset, save=True)
+                    marker.set_ready()
+                    await self._submit(marker, pending_events)
                     new_part = int(data['part'])
-                    self.log_file = _LogFile(
+                    return _LogFile(
                         self.log_file.path.parent,
                         name=self.log_file.name_data.replace(part=new_part)
                     )
-                    return
 
-                event = self._make_event(event_name, data)
+                pending = _Pending(self._make_event(event_name, data),
+                                   f.offset)
 
                 if data_file := event_map.get(event_name):
-                    event = await self._enrich_event(data_file, event)
+                    previous = self._enriching.get(event_name)
+                    nursery.start_soon(self._enrich_pending, data_file,
+                                       pending, previous)
+                    self._enriching[event_name] = pending
 
-                if not self._handle_event(event):
-                    self.log_file = None
-                    return
+                else:
+                    pending.set_ready()
 
-            path = await file_modified.receive()
-            while path == self.log_file.path:
-                try:
-                    path = await file_modified.receive_nowait()
+                if not await self._submit(pending, pending_events):
+                    return None
 
-                except trio.WouldBlock:
-                    break
-            else:
-                self.log_file = _LogFile(path)
-                return
+            _log.trace("{} lines in {} reads from {}",
+                       f.lines, f.reads, self.log_file)
 
-    @staticmethod
-    def _make_event(name: str, data: Dict[str, Any]) -> _events.LogEvent:
+            marker = _Pending(None, f.offset)
+            marker.set_ready()
+            await self._submit(marker, pending_events)
+
+            # Notifications are coalesced, so the one naming a new log may
+            # also stand for lines appended here; read those first.
+            if next_log:
+                return next_log
+
+            # Not back to a log already left after a Continued event.
+            log_file = _LogFile(await self._wait_log_changes(log_changes))
+            if self.log_file < log_file:
+                next_log = log_file
+
+    async def _wait_log_changes(self, log_changes: _LogChanges) -> trio.Path:
+
+        # A checkpoint held back by the throttling is saved once the log
+        # has been idle for a while. Not while the window is busy, whose
+        # markers save checkpoints of their own.
+        while self._unsaved is not None:
+
+            with trio.move_on_after(self.CHECKPOINT_INTERVAL):
+                return await log_changes.wait()
+
+            if not self._in_flight:
+                await self._save_checkpoints()
+
+        return await log_changes.wait()
+
+    async def _submit(self, pending: _Pending,
+                      pending_events: trio.MemorySendChannel) -> bool:
+
+        # With nothing ahead of it, a ready event is handled right away
+        # rather than making the round trip through the window.
+        if not self._in_flight and pending.ready.is_set():
+            return await self._emit(pending)
+
+        self._in_flight += 1
+
+        try:
+            pending_events.send_nowait(pending)
+
+        except trio.WouldBlock:
+            await pending_events.send(pending)
+
+        return True
+
+    async def _emit_events(self, pending_events: trio.MemoryReceiveChannel,
+                           cancel_scope: trio.CancelScope) -> None:
+
+        async with pending_events:
+
+            async for pending in pending_events:
+
+                # Whatever else is queued by now is taken without
+                # a checkpoint per event.
+                while True:
+
+                    if not pending.ready.is_set():
+                        await pending.ready.wait()
+
+                    if not await self._emit(pending):
+                        cancel_scope.cancel()
+                        return
+
+                    self._in_flight -= 1
+
+                    try:
+                        pending = pending_events.receive_nowait()
+
+                    except (trio.WouldBlock, trio.EndOfChannel):
+                        break
+
+    async def _emit(self, pending: _Pending) -> bool:
+
+        if pending.event is None:
+            await self._checkpoint(pending.offset, pending.save)
+            return True
+
+        delay = trio.current_time() - pending.ready_at
+        self.hol_delay += delay
+        self.hol_delay_max = max(self.hol_delay_max, delay)
+        self.emitted += 1
+
+        self.last_timestamp = pending.event._timestamp
+
+        if not self._handle_event(pending.event):
+            await self._checkpoint(pending.offset, save=True)
+            self._shut_down = True
+            return False
+
+        return True
+
+    async def _enrich_pending(self, data_file: '_DataFile', pending: _Pending,
+                              previous: Optional[_Pending]) -> None:
+
+        # Snapshots are purged as they are matched, so events sharing
+        # a side file must be matched in the order they were logged.
+        if previous is not None:
+            await previous.ready.wait()
+
+        pending.event = await self._enrich_event(data_file, pending.event)
+        pending.set_ready()
+
+    async def _resume(self, f: _LineReader) -> None:
+
+        if not self.checkpoints:
+            return
+
+        entry = self.checkpoints.get(self.log_file)
+        if not entry or entry.fingerprint != self.fingerprint:
+            return
+
+        if entry.offset > f.offset:
+            _log.debug("resuming {} at offset {}", self.log_file, entry.offset)
+            await f.seek(entry.offset)
+
+        if entry.timestamp:
+            self.last_timestamp = _types.DateTime.from_elite_string(
+                entry.timestamp
+            )
+
+    async def _checkpoint(self, offset: int, save: bool = False) -> None:
+
+        if not self.checkpoints:
+            return
+
+        entry = self.checkpoints.get(self.log_file)
+        if not entry or entry.offset != offset:
+            self.checkpoints.update(self.log_file, offset, self.fingerprint,
+                                    self.last_timestamp)
+
+            read = offset - entry.offset if entry else offset
+            self._unsaved = (self._unsaved or 0) + max(read, 0)
+
+        if self._unsaved is None:
+            return
+
+        if (save or self._unsaved >= self.CHECKPOINT_BYTES
+                or trio.current_time() - self._saved_at
+                >= self.CHECKPOINT_INTERVAL):
+            await self._save_checkpoints()
+
+    async def _save_checkpoints(self) -> None:
+
+        if not self.checkpoints or self._unsaved is None:
+            return
+
+        self._unsaved = None
+        self._saved_at = trio.current_time()
+
+        # Losing a checkpoint only means reading more on the next start.
+        try:
+            await self.checkpoints.save()
+
+        except OSError as exc:
+            _log.warning("cannot save checkpoints to {}: {}",
+                         self.checkpoints.path, exc)
+
+    def _decode_line(self, line: bytes) -> Dict[str, Any]:
+
+        return _json.decode(line)
+
+    def _make_event(self, name: str,
+                    data: Dict[str, Any]) -> _events.LogEvent:
 
         try:
             # noinspection PyProtectedMember
@@ -305,7 +1097,8 @@ class _Journal:
         except KeyError:
             cls = _events.UnknownEvent
 
-        return cls.from_dict(data, copy=False)
+        return cls.from_dict(data, copy=False, lazy=self.lazy,
+                             trusted=self.trusted)
 
     # noinspection PyProtectedMember
     async def _enrich_event(self, data_file: '_DataFile',
@@ -349,26 +1142,327 @@ class _Journal:
         return True
 
 
+class Backfill:
+
+    journal_path: trio.Path
+    processes: int
+    lazy: bool
+    trusted: bool
+    event_names: Optional[FrozenSet[str]]
+
+    files: int
+    lines: int
+    events: int
+    skipped: int
+    elapsed: float
+
+    def __init__(self, journal_path: trio.Path, processes: int = 1,
+                 lazy: bool = False,
+                 event_names: Optional[Collection[str]] = None,
+                 trusted: bool = False) -> None:
+
+        self.journal_path = trio.Path(journal_path)
+        self.processes = processes or os.cpu_count() or 1
+        self.lazy = lazy
+        self.trusted = trusted
+        self.event_names = (frozenset(event_names)
+                            if event_names is not None else None)
+
+        self.files = 0
+        self.lines = 0
+        self.events = 0
+        self.skipped = 0
+        self.elapsed = 0.0
+
+    def __repr__(self) -> str:
+
+        return f"{type(self).__name__}({self.journal_path!r})"
+
+    @property
+    def events_per_second(self) -> float:
+
+        return self.events / self.elapsed if self.elapsed else 0.0
+
+    async def __aiter__(self) -> AsyncIterator[_events.LogEvent]:
+
+        start = trio.current_time()
+
+        try:
+            if self.processes > 1:
+                async with aclosing(self._replay_parallel()) as events:
+                    async for event in events:
+                        yield event
+
+                return
+
+            expected = None
+
+            for log_file in await _Journal.find_logs(self.journal_path):
+
+                if expected and not log_file.is_same_log(expected):
+                    _log.warning("missing continuation {}", expected)
+
+                expected = None
+
+                async with aclosing(self._replay(log_file)) as events:
+                    async for event in events:
+
+                        if isinstance(event, _LogFile):
+                            expected = event
+                            break
+
+                        yield event
+
+        finally:
+            self.elapsed = trio.current_time() - start
+            _log.info("backfilled {} events ({} skipped) from {} logs"
+                      " in {:.3f} s ({:.0f} events/s)",
+                      self.events, self.skipped, self.files, self.elapsed,
+                      self.events_per_second)
+
+    # noinspection PyProtectedMember
+    async def _replay(
+            self, log_file: _LogFile
+    ) -> AsyncIterator[Union[_events.LogEvent, _LogFile]]:
+
+        journal = _Journal(lazy=self.lazy, event_names=self.event_names,
+                           trusted=self.trusted)
+        journal.log_file = log_file
+
+        async with await log_file.open(mode='rb') as f:
+
+            reader = _LineReader(f, log_file.chunk_size)
+
+            # Such as a log the game has only just created.
+            try:
+                await journal._parse_header(reader)
+
+            except ValueError as exc:
+                _log.warning("skipping {}: {}", log_file, exc)
+                return
+
+            self.files += 1
+
+            try:
+                async for line in reader:
+
+                    if not journal._wants(line):
+                        continue
+
+                    data = journal._decode_line(line)
+                    event_name = data.get('event')
+                    if event_name == 'Continued':
+                        yield _LogFile(
+                            log_file.path.parent,
+                            name=log_file.name_data.replace(
+                                part=int(data['part'])
+                            )
+                        )
+                        return
+
+                    self.events += 1
+                    yield journal._make_event(event_name, data)
+
+            finally:
+                self.lines += reader.lines
+                self.skipped += journal.skipped
+
+    @staticmethod
+    def _chains(log_files: List[_LogFile]) -> List[List[_LogFile]]:
+
+        return [list(chain) for _, chain in itertools.groupby(
+            log_files,
+            key=lambda log_file: log_file.name_data.replace(part=1, suffix='')
+        )]
+
+    # noinspection PyProtectedMember
+    async def _replay_parallel(self) -> AsyncIterator[_events.LogEvent]:
+
+        def timestamp(event: _events.LogEvent) -> _types.DateTime:
+            return event._timestamp
+
+        chains = self._chains(await _Journal.find_logs(self.journal_path))
+
+        executor = concurrent.futures.ProcessPoolExecutor(
+            max_workers=self.processes
+        )
+
+        def submit(chain: List[_LogFile]) -> concurrent.futures.Future:
+            return executor.submit(_replay_chain,
+                                   [str(log_file.path) for log_file in chain],
+                                   self.event_names, self.trusted)
+
+        # Only a few chains are decoded ahead of the one being yielded,
+        # as each finished one waits in the parent with all its events.
+        remaining = iter(chains)
+        futures = deque((chain, submit(chain))
+                        for chain in itertools.islice(remaining,
+                                                      2 * self.processes))
+
+        try:
+            pending = []
+
+            while futures:
+
+                chain, future = futures.popleft()
+                result = await trio.to_thread.run_sync(future.result)
+                events, lines, skipped, invalid = result
+
+                for path in invalid:
+                    _log.warning("skipping {}: invalid header", path)
+
+                for chain_ahead in itertools.islice(remaining, 1):
+                    futures.append((chain_ahead, submit(chain_ahead)))
+
+                self.files += len(chain) - len(invalid)
+                self.lines += lines
+                self.events += len(events)
+                self.skipped += skipped
+
+                if not events:
+                    continue
+
+                # Chains are ordered by the time they were started, so
+                # nothing that is yet to come can precede the first
+                # event of this one.
+                boundary = events[0]._timestamp
+                split = next((i for i, event in enumerate(pending)
+                              if event._timestamp >= boundary),
+                             len(pending))
+
+                for event in pending[:split]:
+                    yield event
+
+                pending = list(heapq.merge(pending[split:], events,
+                                           key=timestamp))
+
+            for event in pending:
+                yield event
+
+        finally:
+            for _, future in futures:
+                future.cancel()
+
+            # Waiting keeps the pool's pipes open until its management
+            # thread is done with them.
+            with trio.CancelScope(shield=True):
+                await trio.to_thread.run_sync(executor.shutdown)
+
+
+# noinspection PyProtectedMember
+def _replay_chain(
+        paths: List[str], event_names: Optional[FrozenSet[str]] = None,
+        trusted: bool = False
+) -> Tuple[List[_events.LogEvent], int, int, List[str]]:
+
+    # Besides the events, the number of lines read and skipped, and the
+    # logs left out for want of a valid header.
+
+    journal = _Journal(event_names=event_names, trusted=trusted)
+    events = []
+    lines = 0
+    invalid = []
+
+    for path in paths:
+
+        with _open_log(path) as f:
+
+            header = f.readline()
+            try:
+                valid = (header.endswith(b'\x0a') and
+                         journal._decode_line(header).get('event')
+                         == 'Fileheader')
+
+            except ValueError:
+                valid = False
+
+            if not valid:
+                invalid.append(path)
+                continue
+
+            for line in f:
+                lines += 1
+
+                if not line.endswith(b'\x0a'):
+                    break
+
+                if not journal._wants(line):
+                    continue
+
+                data = journal._decode_line(line)
+                event_name = data.get('event')
+                if event_name == 'Continued':
+                    break
+
+                events.append(journal._make_event(event_name, data))
+
+        lines += 1
+
+    return events, lines, journal.skipped, invalid
+
+
 class _DataFile:
 
+    # Backoff in seconds while the game is still writing a file.
+    RETRY_DELAYS = (0.01, 0.02, 0.05, 0.1, 0.2)
+
+    # Snapshots kept in addition to the latest one.
+    BACKLOG = 10
+
     event_name: str
     path: trio.Path
     updated: trio.Condition
+    coalesce: bool
+
+    version: int
+    reads: int
+    coalesced: int
+    dropped: int
+    skipped: int
+    retries: int
 
     _event_cls: Type[_events.LogEvent]
-    _buffer: Deque[_events.Event]
-    _decoder: json.JSONDecoder
+    _capacity: int
+    _buffer: List[_events.Event]
+    _timestamps: List[_types.DateTime]
+    _latest: Optional[_events.Event]
+    _fingerprint: Optional[Tuple[int, int, int]]
+    _notify: trio.MemorySendChannel
+    _notified: trio.MemoryReceiveChannel
 
     def __init__(self, event_cls: Type[_events.LogEvent], path: trio.Path,
-                 backlog: int = 10) -> None:
+                 backlog: int = BACKLOG, coalesce: bool = False) -> None:
 
         self._event_cls = event_cls
         self.event_name = event_cls.__name__
         self.path = trio.Path(path)
         self.updated = trio.Condition()
-
-        self._buffer = deque(maxlen=1 + backlog)
-        self._decoder = json.JSONDecoder(strict=True)
+        self.coalesce = coalesce
+
+        # Snapshots enqueued, files read, change notifications folded into
+        # a pending read, and snapshots subscribers skipped because a newer
+        # one had arrived in the meantime.
+        self.version = 0
+        self.reads = 0
+        self.coalesced = 0
+        self.dropped = 0
+
+        # Notifications for a file whose (size, mtime_ns, inode) had not
+        # changed since it was last parsed, and reads of half-written
+        # files that were retried.
+        self.skipped = 0
+        self.retries = 0
+        self._fingerprint = None
+
+        # Oldest first, with the timestamps alongside for bisecting.
+        self._capacity = 1 + (0 if coalesce else backlog)
+        self._buffer = []
+        self._timestamps = []
+        self._latest = None
+
+        # At most one pending notification: the file is read in full
+        # anyway, so any further changes are covered by that read.
+        self._notify, self._notified = trio.open_memory_channel(1)
 
     def __repr__(self) -> str:
 
@@ -389,82 +1483,129 @@ class _DataFile:
 
         return hash(self.path)
 
+    @property
+    def latest(self) -> Optional[_events.Event]:
+
+        # Unlike the buffer, not affected by purging.
+        return self._latest
+
+    def notify(self) -> None:
+
+        try:
+            self._notify.send_nowait(None)
+
+        except trio.WouldBlock:
+            self.coalesced += 1
+
+    async def __aiter__(self) -> AsyncIterator[_events.Event]:
+
+        # Latest-value subscription: a slow consumer gets the freshest
+        # snapshot next, not every one in between.
+
+        version = self.version
+
+        while True:
+
+            async with self.updated:
+                while self.version == version:
+                    await self.updated.wait()
+
+                self.dropped += self.version - version - 1
+                version = self.version
+                event = self._latest
+
+            yield event
+
     def enqueue(self, event: _events.Event) -> None:
 
-        if not self._buffer or event >= self._buffer[0]:
-            self._buffer.appendleft(event)
-            return
+        self.version += 1
 
-        # Supposedly very unlikely case (therefore not efficient):
+        if self._latest is None or event >= self._latest:
+            self._latest = event
 
-        if len(self._buffer) == self._buffer.maxlen:
-            self._buffer.pop()
+        if len(self._buffer) == self._capacity:
+            del self._buffer[0]
+            del self._timestamps[0]
 
-        for i, compare in enumerate(self._buffer):
-            if event >= compare:
-                self._buffer.insert(i, event)
-                break
-        else:
-            self._buffer.append(event)
+        # After any snapshots with the same timestamp.
+        i = bisect.bisect_right(self._timestamps, event._timestamp)
+        self._buffer.insert(i, event)
+        self._timestamps.insert(i, event._timestamp)
 
     def find(self, timestamp: _types.DateTime) -> Optional[_events.Event]:
 
+        # The latest snapshot only on an exact match, otherwise the
+        # oldest one not preceding the timestamp.
+
         if not self._buffer:
             return None
 
-        event = self._buffer[0]
-        if timestamp >= event._timestamp:
-            return event if timestamp == event._timestamp else None
+        if timestamp >= self._timestamps[-1]:
+            if timestamp == self._timestamps[-1]:
+                return self._buffer[-1]
 
-        # Supposedly very unlikely case (therefore not efficient):
+            return None
 
-        for event in reversed(self._buffer):
-            if timestamp <= event._timestamp:
-                return event
+        return self._buffer[bisect.bisect_left(self._timestamps, timestamp)]
 
     def purge_up_to(self, timestamp: _types.DateTime) -> None:
 
-        if not self._buffer:
-            return
+        i = bisect.bisect_right(self._timestamps, timestamp)
+        del self._buffer[:i]
+        del self._timestamps[:i]
 
-        if timestamp >= self._buffer[0]._timestamp:
-            self._buffer.clear()
-            return
+    async def _read_data(self) -> Optional[Dict[str, Any]]:
+
+        for delay in self.RETRY_DELAYS + (None,):
 
-        # Supposedly very unlikely case (therefore not efficient):
+            st = await self.path.stat()
+            fingerprint = st.st_size, st.st_mtime_ns, st.st_ino
+            if fingerprint == self._fingerprint:
+                self.skipped += 1
+                return None
+
+            try:
+                data = _json.decode(await self.path.read_bytes())
+                break
 
-        while timestamp >= self._buffer[-1]._timestamp:
-            self._buffer.pop()
+            except ValueError:
+                # Most likely caught the game in the middle of a write.
+                if delay is None:
+                    raise
 
-    async def _read_data(self) -> Dict[str, Any]:
+                self.retries += 1
+                await trio.sleep(delay)
 
-        data = await self.path.read_text(encoding='utf-8', errors='strict')
-        data = self._decoder.decode(data)
         assert data.get('event') == self.event_name
         if 'timestamp' not in data:
-            st = await self.path.stat()
             dt = _types.DateTime.fromtimestamp(st.st_mtime)
             data['timestamp'] = dt.to_elite_string()
 
+        self._fingerprint = fingerprint
         return data
 
-    async def async_loop(self, file_modified: trio.MemoryReceiveChannel) -> None:
-
-        async with file_modified:
+    async def async_loop(self) -> None:
 
-            while True:
+        self.notify()
 
-                try:
-                    while True:
-                        await file_modified.receive_nowait()
+        async with self._notified:
 
-                except trio.WouldBlock:
-                    pass
+            async for _ in self._notified:
 
                 try:
                     data = await self._read_data()
+                    if data is None:
+                        continue
+
+                    self.reads += 1
                     event = self._event_cls.from_dict(data, copy=False)
 
+                except ValueError as exc:
+                    # Still incomplete after all retries; the game's next
+                    # write will notify again.
+                    _log.warning("unreadable {}: {}", self.path, exc)
+                    continue
+
                 except Exception as exc:
                     _log.exception(str(exc))
 
@@ -473,31 +1614,28 @@ class _DataFile:
                         self.enqueue(event)
                         self.updated.notify_all()
 
-                await file_modified.receive()
+                    _log.trace("{} read {} times, {} changes coalesced,"
+                               " {} skipped, {} retries, {} snapshots dropped",
+                               self.path.name, self.reads, self.coalesced,
+                               self.skipped, self.retries, self.dropped)
 
 
 def spawn_json_tasks(
-        nursery: trio.Nursery, journal_path: trio.Path
-) -> dict[trio.Path, trio.MemorySendChannel]:
+        nursery: trio.Nursery, journal_path: trio.Path,
+        backlog: int = _DataFile.BACKLOG
+) -> dict[trio.Path, _DataFile]:
 
     watch_map = {}
     event_map = {}
 
-    for event_cls, file_name in [
-        (_events.Cargo, 'Cargo.json'),
-        (_events.Market, 'Market.json'),
-        (_events.ModuleInfo, 'ModulesInfo.json'),
-        (_events.NavRoute, 'NavRoute.json'),
-        (_events.Outfitting, 'Outfitting.json'),
-        (_events.Shipyard, 'Shipyard.json'),
-        (_events.Status, 'Status.json'),
-    ]:
-        data_file = _DataFile(event_cls, journal_path / file_name)
-
-        send_endpoint, recv_endpoint = trio.open_memory_channel(0)
-        nursery.start_soon(data_file.async_loop, recv_endpoint)
-
-        watch_map[data_file.path] = send_endpoint
+    for event_cls, file_name in _DATA_FILES:
+        data_file = _DataFile(event_cls, journal_path / file_name,
+                              backlog=backlog,
+                              coalesce=event_cls in _LATEST_ONLY)
+
+        nursery.start_soon(data_file.async_loop)
+
+        watch_map[data_file.path] = data_file
         event_map[data_file.event_name] = data_file
 
     EventMap.set(event_map)
@@ -505,23 +1643,47 @@ def spawn_json_tasks(
     return watch_map
 
 
-def spawn_log_task(
-        nursery: trio.Nursery, journal: _Journal
-) -> trio.MemorySendChannel:
+def spawn_log_task(nursery: trio.Nursery, journal: _Journal) -> _LogChanges:
+
+    log_changes = _LogChanges()
+    nursery.start_soon(journal.async_loop, log_changes)
+
+    return log_changes
+
+
+@asynccontextmanager
+async def open_watcher(
+        journal_path: trio.Path
+) -> AsyncIterator[AsyncIterable[Set['watchgod.watcher.FileChange']]]:
+
+    try:
+        watcher = _InotifyWatcher(journal_path)
+
+    except OSError as exc:
+        _log.info("falling back to polling {}: {}", journal_path, exc)
 
-    send_endpoint, recv_endpoint = trio.open_memory_channel(100)
-    nursery.start_soon(journal.async_loop, recv_endpoint)
+    else:
+        with watcher:
+            yield watcher
 
-    return send_endpoint
+        return
+
+    async with trio_asyncio.open_loop():
+
+        awatch = watchgod.awatch(journal_path, watcher_cls=_JournalWatcher,
+                                 debounce=500, normal_sleep=200)
+        awatch._executor = trio_asyncio.TrioExecutor(max_workers=2)
+
+        yield trio_asyncio.aio_as_trio(awatch)
 
 
 async def watch_journal(
-        awatch: watchgod.awatch,
-        watch_map: dict[trio.Path, trio.MemorySendChannel],
-        log_endpoint: trio.MemorySendChannel,
+        watcher: AsyncIterable[Set['watchgod.watcher.FileChange']],
+        watch_map: dict[trio.Path, _DataFile],
+        log_changes: _LogChanges,
 ) -> None:
 
-    async for changes in trio_asyncio.aio_as_trio(awatch):
+    async for changes in watcher:
 
         changed = {trio.Path(path) for change, path in changes
                    if change != watchgod.Change.deleted}
@@ -536,13 +1698,13 @@ async def watch_journal(
         ), default=None)
 
         for path in data_affected:
-            watch_map[path].send_nowait(...)
+            watch_map[path].notify()
 
         if data_affected and log_affected:
             await trio.sleep(0)
 
         if log_affected:
-            log_endpoint.send_nowait(log_affected.path)
+            log_changes.notify(log_affected.path)
 
 
 async def loop(task_status=trio.TASK_STATUS_IGNORED) -> None:
@@ -551,18 +1713,20 @@ async def loop(task_status=trio.TASK_STATUS_IGNORED) -> None:
         'Saved Games/Frontier Developments/Elite Dangerous'
     )
 
-    journal = _Journal()
-    await journal.find_initial_log(journal_path)
+    checkpoints = _Checkpoints(
+        (await trio.Path.home()) / '.continued' / 'checkpoints.json'
+    )
+    await checkpoints.load()
 
-    awatch = watchgod.awatch(journal_path, watcher_cls=_JournalWatcher,
-                             debounce=500, normal_sleep=200)
-    awatch._executor = trio_asyncio.TrioExecutor(max_workers=2)
+    journal = _Journal(checkpoints)
+    await journal.find_initial_log(journal_path)
 
-    async with trio.open_nursery() as nursery:
+    async with open_watcher(journal_path) as watcher, \
+            trio.open_nursery() as nursery:
 
         watch_map = spawn_json_tasks(nursery, journal_path)
-        log_endpoint = spawn_log_task(nursery, journal)
+        log_changes = spawn_log_task(nursery, journal)
 
         task_status.started()
 
-        await watch_journal(awatch, watch_map, log_endpoint)
+        await watch_journal(watcher, watch_map, log_changes)
@@ -37,14 +37,23 @@ from numbers import (
     Real as _Real,
 )
 
+import calendar as _calendar
+import datetime as _datetime
+import itertools as _itertools
+import re as _re
 import sys as _sys
+import time as _time
 
+from abc import ABCMeta as _ABCMeta
 from collections import namedtuple as _namedtuple
+from contextlib import contextmanager as _contextmanager
+from contextvars import ContextVar as _ContextVar
 from copy import deepcopy as _deepcopy
 
 import pendulum as _pendulum
 
 from pendulum.parsing import parse_iso8601 as _parse_iso8601
+from pendulum.tz.timezone import Timezone as _Timezone
 
 
 # A singleton distinct from None, so both absence of an argument
@@ -64,11 +73,35 @@ Coords = _namedtuple('Coords', 'x y z')
 
 class L(str):
 
+    # No instance __dict__. Game symbols such as '$economy_Agri;' come from
+    # a limited vocabulary and are interned, and the intern table holds
+    # their localised twins. Other values (chat, pilot names) are not
+    # interned, so they cannot grow the table, and are their own localised
+    # string; the rare one with a twin of its own is a _LocalisedText.
+
+    __slots__ = ()
+
+    INTERN_LIMIT = 1 << 16
+
+    # Interned values by (class, symbol) and then by localised string.
+    _interned: _Dict[_Tuple[type, str], _Dict[str, 'L']] = {}
+    _interned_count = 0
+
     class localised:
 
         def __get__(self, instance, owner=None) -> str:
 
-            return instance.__dict__['localised']
+            if instance is None:
+                return self
+
+            s = str(instance)
+
+            twins = L._interned.get((type(instance), s), {})
+            for localised, value in twins.items():
+                if value is instance:
+                    return localised
+
+            return s
 
         def __set__(self, instance, value) -> None:
 
@@ -82,31 +115,208 @@ class L(str):
         if isinstance(s, L) and localised is ABSENT:
             return s
 
-        obj = super().__new__(cls) if s is ABSENT else super().__new__(cls, s)
+        s = '' if s is ABSENT else str(s)
+        localised = s if localised in (ABSENT, None) else str(localised)
 
-        if localised not in (ABSENT, None):
-            obj.__dict__['localised'] = str(localised)
+        intern = s.startswith('$') and s.endswith(';')
 
-        else:
-            obj.__dict__['localised'] = str(obj)
+        if intern:
+            try:
+                return L._interned[cls, s][localised]
+
+            except KeyError:
+                intern = L._interned_count < L.INTERN_LIMIT
+
+        if localised != s and not intern:
+            obj = super().__new__(_LocalisedText, s)
+            obj.__dict__['localised'] = localised
+            return obj
+
+        obj = super().__new__(cls, s)
+
+        if intern:
+            L._interned.setdefault((cls, s), {})[localised] = obj
+            L._interned_count += 1
 
         return obj
 
+    def __reduce__(self) -> _Tuple[type, _Tuple[str, str]]:
+
+        return type(self), (str(self), self.localised)
+
     def __repr__(self) -> str:
 
         s = str(self)
-        localised = self.__dict__['localised']
+        localised = self.localised
+        name = self.__reduce__()[0].__name__
         if localised == s:
-            return f"{type(self).__name__}({s!r})"
+            return f"{name}({s!r})"
+
+        return f"{name}({s!r}, {localised!r})"
+
+
+class _LocalisedText(L):
+
+    # A value that is not interned but has a localised twin of its own,
+    # which only an instance __dict__ can hold. Rare, since the game
+    # localises symbols rather than free text.
 
-        return f"{type(self).__name__}({s!r}, {localised!r})"
+    @property
+    def localised(self) -> str:
+
+        return self.__dict__['localised']
+
+    def __reduce__(self) -> _Tuple[type, _Tuple[str, str]]:
+
+        return L, (str(self), self.localised)
+
+
+_RE_ELITE_TIMESTAMP = _re.compile(
+    r'(\d{4})-(\d{2})-(\d{2})T(\d{2}):(\d{2}):(\d{2})Z', _re.ASCII
+)
+
+_FMT_ELITE_TIMESTAMP = '%Y-%m-%dT%H:%M:%SZ'
+
+_EPOCH_ORDINAL = _datetime.date(1970, 1, 1).toordinal()
+
+
+def _split_elite_timestamp(timestamp: str) -> _Optional[_Tuple[int, ...]]:
+
+    m = _RE_ELITE_TIMESTAMP.fullmatch(timestamp)
+    if not m:
+        return None
+
+    return tuple(map(int, m.groups()))
 
 
 class DateTime(_pendulum.DateTime):
 
+    MEMO_SIZE = 256
+    EPOCH_SPAN = 900
+
+    _memo: _Dict[_Tuple[type, str, _Any], 'DateTime'] = {}
+    _shifts: _Dict[_Tuple[_Any, int], _Optional[_Tuple[int, int]]] = {}
+    _offsets: _Dict[_Any, int] = {}
+    _strings: _Dict[_Tuple['DateTime', _Any, int], str] = {}
+
     @classmethod
     def from_elite_string(cls, timestamp: str, tz=None) -> 'DateTime':
 
+        key = (cls, timestamp, tz)
+
+        try:
+            return cls._memo[key]
+
+        except KeyError:
+            pass
+
+        except TypeError:
+            return cls._from_elite_string(timestamp, tz)
+
+        dt = cls._from_elite_string(timestamp, tz)
+
+        if len(cls._memo) >= cls.MEMO_SIZE:
+            cls._memo.clear()
+
+        cls._memo[key] = dt
+        return dt
+
+    @classmethod
+    def from_epoch(cls, t: int, tz=None) -> 'DateTime':
+
+        if tz is None:
+            tz = _pendulum.local_timezone()
+        elif not isinstance(tz, _datetime.tzinfo):
+            tz = _pendulum.timezone(tz)
+
+        shift = cls._shift(tz, t)
+        if shift is None:
+            return cls._from_utc_fields(_time.gmtime(t)[:6], tz)
+
+        offset, fold = shift
+        return cls(*_time.gmtime(t + offset)[:6], tzinfo=tz, fold=fold)
+
+    def to_epoch(self) -> int:
+
+        # Whole seconds only. Tries the offset seen last for the same
+        # time zone, which is right unless a DST transition intervened.
+
+        tz = self.tzinfo
+        wall = ((self.toordinal() - _EPOCH_ORDINAL) * 86400
+                + self.hour * 3600 + self.minute * 60 + self.second)
+
+        offset = DateTime._offsets.get(tz)
+        if offset is not None:
+            t = wall - offset
+            if self._shift(tz, t) == (offset, self.fold):
+                return t
+
+        t = int(self.timestamp())
+
+        shift = self._shift(tz, t)
+        if shift is not None:
+            DateTime._offsets[tz] = shift[0]
+
+        return t
+
+    @classmethod
+    def _shift(cls, tz, t: int) -> _Optional[_Tuple[int, int]]:
+
+        # Offset and fold are determined once per span of EPOCH_SPAN
+        # seconds, as long as they are the same at both of its ends.
+        # No time zone changes its offset twice within such a span.
+        key = (tz, t // cls.EPOCH_SPAN)
+
+        try:
+            return DateTime._shifts[key]
+
+        except KeyError:
+            pass
+
+        except TypeError:
+            return None
+
+        shifts = set()
+        start = key[1] * cls.EPOCH_SPAN
+
+        for t in (start, start + cls.EPOCH_SPAN - 1):
+            dt = cls._from_utc_fields(_time.gmtime(t)[:6], tz)
+            wall = _calendar.timegm((dt.year, dt.month, dt.day,
+                                     dt.hour, dt.minute, dt.second))
+            shifts.add((wall - t, dt.fold))
+
+        shift = shifts.pop() if len(shifts) == 1 else None
+
+        if len(DateTime._shifts) >= cls.MEMO_SIZE:
+            DateTime._shifts.clear()
+
+        DateTime._shifts[key] = shift
+        return shift
+
+    @classmethod
+    def _from_utc_fields(cls, fields: _Tuple[int, ...], tz=None) -> 'DateTime':
+
+        if tz is None:
+            tz = _pendulum.local_timezone()
+        elif not isinstance(tz, _datetime.tzinfo):
+            tz = _pendulum.timezone(tz)
+
+        dt = _datetime.datetime(*fields, tzinfo=_pendulum.UTC)
+        dt = tz.convert(dt) if isinstance(tz, _Timezone) else dt.astimezone(tz)
+
+        return cls(dt.year, dt.month, dt.day,
+                   dt.hour, dt.minute, dt.second,
+                   tzinfo=dt.tzinfo, fold=dt.fold)
+
+    @classmethod
+    def _from_elite_string(cls, timestamp: str, tz=None) -> 'DateTime':
+
+        fields = _split_elite_timestamp(timestamp)
+
+        if fields is not None and (isinstance(tz, _Timezone)
+                                   or not isinstance(tz, _datetime.tzinfo)):
+            return cls._from_utc_fields(fields, tz)
+
         dt = _parse_iso8601(timestamp)
         dt = _pendulum.instance(dt, tz=_pendulum.local_timezone())
         dt = dt.in_timezone(tz)
@@ -118,10 +328,21 @@ class DateTime(_pendulum.DateTime):
 
     def to_elite_string(self) -> str:
 
-        dt = self.in_timezone(_pendulum.UTC)
-        dt = dt.replace(microsecond=0)
-        timestamp = dt.to_iso8601_string()
+        # Datetimes with the same tzinfo compare equal by their wall time
+        # alone, so the fold is needed to tell the two sides of a DST
+        # transition apart.
+        key = (self, self.tzinfo, self.fold)
+
+        timestamp = DateTime._strings.get(key)
+        if timestamp is not None:
+            return timestamp
+
+        timestamp = _time.strftime(_FMT_ELITE_TIMESTAMP, self.utctimetuple())
+
+        if len(DateTime._strings) >= self.MEMO_SIZE:
+            DateTime._strings.clear()
 
+        DateTime._strings[key] = timestamp
         return timestamp
 
     @classmethod
@@ -170,20 +391,111 @@ class DateTime(_pendulum.DateTime):
                    tzinfo=dt.tzinfo, fold=dt.fold)
 
 
+class Timestamp(int):
+
+    # Compact alternative to DateTime: whole seconds since the epoch,
+    # converted to a DateTime only on request.
+
+    __slots__ = ()
+
+    @classmethod
+    def from_elite_string(cls, timestamp: str) -> 'Timestamp':
+
+        fields = _split_elite_timestamp(timestamp)
+        if fields is None:
+            return cls.from_datetime(DateTime.from_elite_string(timestamp))
+
+        return cls(_calendar.timegm(fields))
+
+    @classmethod
+    def from_datetime(cls, dt: _datetime.datetime) -> 'Timestamp':
+
+        return cls(_calendar.timegm(dt.utctimetuple()))
+
+    @classmethod
+    def now(cls) -> 'Timestamp':
+
+        return cls(_time.time())
+
+    def to_elite_string(self) -> str:
+
+        return _time.strftime(_FMT_ELITE_TIMESTAMP, _time.gmtime(self))
+
+    def to_datetime(self, tz=None) -> DateTime:
+
+        return DateTime.from_epoch(int(self), tz)
+
+    def __repr__(self) -> str:
+
+        return f"{type(self).__name__}({self.to_elite_string()!r})"
+
+
+_TRUSTED: _ContextVar[bool] = _ContextVar('trusted', default=False)
+
+
+@_contextmanager
+def trusted_decoding(enable: bool = True) -> _Iterator[None]:
+
+    # Makes Data.from_dict() treat its input as already validated,
+    # unless told otherwise per call.
+
+    token = _TRUSTED.set(enable)
+
+    try:
+        yield
+
+    finally:
+        _TRUSTED.reset(token)
+
+
 _REVERT_MARKER = object()
+
+# How Data's Mapping protocol turns an attribute into key/value pairs.
+_K_VALUE = 0            # the stored value as is
+_K_REVERT = 1           # attr.revert(value), which needs no memo
+_K_REVERT_MEMO = 2      # attr.revert(value, memo)
+_K_L = 3                # the string of a delegated L
+_K_L_LOCALISED = 4      # the localised string of a delegated L
+_K_DELEGATE = 5         # keys of a delegated Data or dict
 _D = _TypeVar('_D')
 
 
-class Data(_Mapping):
+class _DataMeta(_ABCMeta):
+
+    def __new__(mcs, name: str, bases: _Tuple[type, ...],
+                namespace: _Dict[str, _Any], compact: bool = False,
+                **kwargs) -> type:
+
+        # Compact classes have neither an instance __dict__ nor
+        # a per-instance dict for their attribute values.
+        if compact:
+            namespace.setdefault('__slots__', ())
+
+        namespace['_compact'] = compact
+
+        return super().__new__(mcs, name, bases, namespace, **kwargs)
+
+
+class Data(_Mapping, metaclass=_DataMeta):
+
+    __slots__ = ('_data', '_unknown', '__weakref__')
 
     _attrs: _Dict[str, 'Attr'] = {}
     _key_map: _Dict[str, 'Attr'] = {}
+    _key_layout: _Dict[str, _Tuple[str, int, _Optional[_Callable]]] = {}
+    _name_layout: _Dict[str, _Tuple[_Any, int, _Optional[_Callable]]] = {}
+    _name_keys: _Dict[str, _Any] = {}
+    _delegates: _Tuple[_Tuple[str, bool], ...] = ()
+    _epoch_fields: _Tuple[int, ...] = ()
+    _compact: bool
+    _entries_cls: _Optional[_Type['_CompactEntries']] = None
+    _flyweights: _Optional['_Flyweights'] = None
 
     _data: _Dict[str, _Any]
     _unknown: _Dict[str, _Any]
 
     @classmethod
-    def __init_subclass__(cls, **kwargs) -> None:
+    def __init_subclass__(cls, flyweight: int = 0, **kwargs) -> None:
 
         super().__init_subclass__(**kwargs)
 
@@ -205,6 +517,62 @@ class Data(_Mapping):
             else:
                 key_map[attr.key] = attr
 
+        cls._make_layout()
+
+        cls._entries_cls = (_CompactEntries.for_attrs(cls)
+                            if cls._compact else None)
+
+        cls._decode = classmethod(_make_decoder(cls))
+        cls._decode_trusted = classmethod(_make_decoder(cls, trusted=True))
+
+        cls._flyweights = _Flyweights(cls, flyweight) if flyweight else None
+
+    @classmethod
+    def _make_layout(cls) -> None:
+
+        # Everything the Mapping protocol needs to know about an attribute,
+        # resolved once per class instead of on every access.
+
+        key_layout = cls._key_layout = {}
+        name_layout = cls._name_layout = {}
+        delegates = []
+
+        for name, attr in cls._attrs.items():
+
+            if attr.delegate and issubclass(attr.type, L):
+                key1, key2 = attr.key
+                key_layout[key1] = (name, _K_L, None)
+                key_layout[key2] = (name, _K_L_LOCALISED, None)
+                name_layout[name] = (attr.key, _K_L, None)
+                delegates.append((name, True))
+
+            elif attr.delegate:
+                key_layout.update((k, (name, _K_DELEGATE, None))
+                                  for k in attr.key)
+                name_layout[name] = (attr.key, _K_DELEGATE, None)
+                delegates.append((name, False))
+
+            else:
+                if not attr.revert:
+                    kind = _K_VALUE
+                elif attr.revert in _MEMOLESS_REVERTS:
+                    kind = _K_REVERT
+                else:
+                    kind = _K_REVERT_MEMO
+
+                key_layout[attr.key] = (name, kind, attr.revert or None)
+                name_layout[name] = (attr.key, kind, attr.revert or None)
+
+        cls._name_keys = {name: key for name, (key, _, _) in name_layout.items()}
+        cls._delegates = tuple(delegates)
+
+        # Positions of the DateTime attributes, which __reduce__() packs
+        # as epoch seconds where that loses nothing.
+        cls._epoch_fields = tuple(
+            i for i, attr in enumerate(cls._attrs.values())
+            if isinstance(attr.type, type) and issubclass(attr.type, DateTime)
+        )
+
     def __init__(self, _unknown=None, **kwargs) -> None:
 
         self._data = {}
@@ -243,60 +611,123 @@ class Data(_Mapping):
             elif attr.delegate and not issubclass(attr.type, L):
                 self._data[attr.name] = attr.type()
 
+        if self._entries_cls:
+            self._data = self._entries_cls.from_mapping(self._data)
+            self._unknown = self._unknown or _NO_UNKNOWN
+
         super().__init__(**kwargs)
 
     @classmethod
-    def from_dict(cls: _Type[_D], data: _Mapping[str, _Any], copy=True) -> _D:
+    def from_dict(cls: _Type[_D], data: _Mapping[str, _Any], copy=True,
+                  lazy=False, trusted: _Optional[bool] = None) -> _D:
 
-        obj = super().__new__(cls)
-        obj._data = {}
+        # Trusted data skips precheck and validate, and is only copied
+        # shallowly, so the result shares the leaves of the input. The
+        # mode sticks to nested objects via the context variable.
+        context = _TRUSTED.get()
+        if trusted is None:
+            trusted = context
+
+        elif trusted != context:
+            with trusted_decoding(trusted):
+                return cls.from_dict(data, copy=copy, lazy=lazy)
+
+        if cls._flyweights and not lazy:
+            return cls._flyweights.get(data, copy, trusted)
+
+        if trusted:
+            if copy or not isinstance(data, _MutableMapping):
+                data = dict(data)
+
+            if lazy:
+                return cls._decode_lazy(data, trusted=True)
+
+            return cls._decode_trusted(data)
 
         if copy or not isinstance(data, _MutableMapping):
             data = _deepcopy(data)
 
-        for name, attr in cls._attrs.items():
+        if lazy:
+            return cls._decode_lazy(data)
 
-            if attr.delegate:
+        return cls._decode(data)
 
-                if issubclass(attr.type, L):
+    @classmethod
+    def _decode(cls: _Type[_D], data: _MutableMapping[str, _Any]) -> _D:
 
-                    value = [data.pop(k, None) for k in attr.key]
-                    if value[0] is None:
-                        value = attr.default_factory()
+        # Replaced by a generated function for every subclass,
+        # see _make_decoder() for the equivalent generic version.
+        return cls._decode_generic(data)
 
-                    else:
-                        value = cls._init_entry(attr, value)
+    @classmethod
+    def _decode_trusted(cls: _Type[_D],
+                        data: _MutableMapping[str, _Any]) -> _D:
 
-                else:
-                    value = {}
-                    for key in attr.key:
-                        try:
-                            value[key] = data.pop(key)
-                        except KeyError:
-                            pass
+        # Also replaced by a generated function for every subclass.
+        return cls._decode_generic(data, trusted=True)
 
-                    value = cls._init_entry(attr, value)
+    @classmethod
+    def _decode_lazy(cls: _Type[_D], data: _MutableMapping[str, _Any],
+                     trusted=False) -> _D:
+
+        return cls._decode_generic(data, lazy=True, trusted=trusted)
+
+    @classmethod
+    def _decode_generic(cls: _Type[_D], data: _MutableMapping[str, _Any],
+                        lazy=False, trusted=False) -> _D:
+
+        obj = super().__new__(cls)
+        obj._data = entries = (_LazyEntries(cls._attrs, trusted) if lazy
+                               else {})
+
+        for name, attr in cls._attrs.items():
+
+            if not attr.delegate:
+                value = data.pop(attr.key, ABSENT)
+
+            elif issubclass(attr.type, L):
+                value = [data.pop(k, None) for k in attr.key]
+                if value[0] is None:
+                    value = ABSENT
 
             else:
-                try:
-                    value = data.pop(attr.key)
+                value = {}
+                for key in attr.key:
+                    try:
+                        value[key] = data.pop(key)
+                    except KeyError:
+                        pass
+
+            if value is ABSENT:
+                value = attr.default_factory()
 
-                except KeyError:
-                    value = attr.default_factory()
+            elif lazy:
+                entries.defer(name, value)
+                continue
 
-                else:
-                    value = cls._init_entry(attr, value)
+            else:
+                value = cls._init_entry(attr, value, trusted)
 
             if value is not None:
-                obj._data[attr.name] = value
+                entries[attr.name] = value
+
+        if cls._entries_cls and not lazy:
+            obj._data = cls._entries_cls.from_mapping(entries)
+            obj._unknown = data or _NO_UNKNOWN
+            return obj
 
         obj._unknown = data
         return obj
 
+    def validate(self) -> None:
+
+        if isinstance(self._data, _LazyEntries):
+            self._data.resolve_all()
+
     @staticmethod
-    def _init_entry(attr: 'Attr', value: _Any) -> _Any:
+    def _init_entry(attr: 'Attr', value: _Any, trusted=False) -> _Any:
 
-        if attr.precheck and not attr.precheck(value):
+        if not trusted and attr.precheck and not attr.precheck(value):
             raise ValueError(
                 f"invalid value {value!r} for member {attr.key}"
             )
@@ -309,7 +740,7 @@ class Data(_Mapping):
         elif not isinstance(value, attr.type):
             value = attr.type(value)
 
-        if attr.validate and not attr.validate(value):
+        if not trusted and attr.validate and not attr.validate(value):
             raise ValueError(
                 f"invalid value {value!r} for member {attr.key}"
             )
@@ -335,116 +766,150 @@ class Data(_Mapping):
 
         return f"{type(self).__name__}({', '.join(args)})"
 
+    def __eq__(self, other) -> bool:
+
+        if self is other:
+            return True
+
+        return super().__eq__(other)
+
     def __bool__(self) -> bool:
 
         return bool(len(self._data))
 
     def __len__(self) -> int:
 
-        return sum(
-            (2 if isinstance(value, L) else len(value))
-            if self._attrs[name].delegate else 1
-            for name, value in self._data.items()
-        ) + len(self._unknown)
+        n = len(self._data) + len(self._unknown)
 
-    def __contains__(self, key) -> bool:
+        for name, is_l in self._delegates:
+            value = self._data.get(name)
+            if value is not None:
+                n += 1 if is_l else len(value) - 1
 
-        try:
-            attr = self._key_map[key]
+        return n
 
-        except KeyError:
+    def __contains__(self, key) -> bool:
+
+        entry = self._key_layout.get(key)
+        if entry is None:
             return key in self._unknown
 
-        if attr.delegate and not issubclass(attr.type, L):
-            return key in self._data[attr.name]
+        name, kind, _ = entry
 
-        return attr.name in self._data
+        if kind == _K_DELEGATE:
+            return key in self._data.get(name, ())
 
-    def __getitem__(self, key) -> _Any:
+        return name in self._data
 
-        try:
-            attr = self._key_map[key]
+    def __getitem__(self, key) -> _Any:
 
-        except KeyError:
+        entry = self._key_layout.get(key)
+        if entry is None:
             return self._unknown[key]
 
-        if attr.delegate:
-            if not issubclass(attr.type, L):
-                return self._data[attr.name][key]
+        name, kind, revert = entry
+        value = self._data[name]
 
-            value = self._data[attr.name]
-            return value.localised if key.endswith('_Localised') else str(value)
+        if kind == _K_REVERT:
+            return revert(value, None)
 
-        value = self._data[attr.name]
-        return (attr.revert(value, {id(_REVERT_MARKER): _REVERT_MARKER})
-                if attr.revert else value)
+        if kind == _K_VALUE:
+            return value
 
-    def __iter__(self) -> _Iterator[str]:
+        if kind == _K_REVERT_MEMO:
+            return revert(value, {id(_REVERT_MARKER): _REVERT_MARKER})
 
-        for name, value in self._data.items():
-            attr = self._attrs[name]
+        if kind == _K_L:
+            return str(value)
 
-            if attr.delegate:
-                if not issubclass(attr.type, L):
-                    yield from value
-                else:
-                    yield from attr.key
-                continue
+        if kind == _K_L_LOCALISED:
+            return value.localised
 
-            yield attr.key
+        return value[key]
 
-        yield from self._unknown.keys()
+    def __iter__(self) -> _Iterator[str]:
 
-    def __iteritems__(self) -> _Iterator[_Tuple[str, _Any]]:
+        if not self._delegates:
+            keys = map(self._name_keys.__getitem__, self._data)
+            return _itertools.chain(keys, self._unknown)
+
+        return self._iter_keys()
+
+    def _iter_keys(self) -> _Iterator[str]:
+
+        layout = self._name_layout
 
         for name, value in self._data.items():
-            attr = self._attrs[name]
+            key, kind, _ = layout[name]
 
-            if attr.delegate:
-                if not issubclass(attr.type, L):
-                    yield from value.__iteritems__()
-                else:
-                    yield from zip(attr.key, (str(value), value.localised))
-                continue
+            if kind == _K_DELEGATE:
+                yield from value
+            elif kind == _K_L:
+                yield from key
+            else:
+                yield key
 
-            yield (attr.key,
-                   attr.revert(value, {id(_REVERT_MARKER): _REVERT_MARKER})
-                   if attr.revert else value)
+        yield from self._unknown
 
-        yield from self._unknown.items()
+    def __iteritems__(self) -> _Iterator[_Tuple[str, _Any]]:
 
-    def keys(self) -> _KeysView:
+        layout = self._name_layout
 
-        class KeysView(_KeysView):
-            def __init__(self, data: Data) -> None:
-                super().__init__(data)
+        for name, value in self._data.items():
+            key, kind, revert = layout[name]
+
+            if kind == _K_REVERT:
+                yield key, revert(value, None)
+            elif kind == _K_VALUE:
+                yield key, value
+            elif kind == _K_REVERT_MEMO:
+                yield key, revert(value, {id(_REVERT_MARKER): _REVERT_MARKER})
+            elif kind == _K_L:
+                yield key[0], str(value)
+                yield key[1], value.localised
+            else:
+                yield from value.__iteritems__()
 
-                self.__iter__ = data.__iter__
-                self.__len__ = data.__len__
+        yield from self._unknown.items()
 
-        return KeysView(self)
+    def keys(self) -> _KeysView:
+
+        return _DataKeysView(self)
 
     def items(self) -> _ItemsView:
 
-        class ItemsView(_ItemsView):
-            def __init__(self, data: Data) -> None:
-                super().__init__(data)
+        return _DataItemsView(self)
 
-                self.__iter__ = data.__iteritems__
-                self.__len__ = data.__len__
+    def values(self) -> _ValuesView:
 
-        return ItemsView(self)
+        return _DataValuesView(self)
 
-    def values(self) -> _ValuesView:
+    def to_dict(self) -> _Dict[str, _Any]:
 
-        class ValuesView(_ValuesView):
-            def __init__(self, data: Data) -> None:
-                super().__init__(data)
+        # Like the plain dict produced by reverting a deep copy, but
+        # immutable leaves and unknown members are shared, not copied.
 
-                self.__iter__ = lambda: (v for _, v in data.__iteritems__())
-                self.__len__ = data.__len__
+        d = {}
+
+        for name, value in self._data.items():
+            key, kind, revert = self._name_layout[name]
+
+            if kind == _K_REVERT:
+                d[key] = revert(value, None)
+            elif kind == _K_VALUE:
+                d[key] = value
+            elif kind == _K_REVERT_MEMO:
+                d[key] = _export(revert, value)
+            elif kind == _K_L:
+                d[key[0]] = str(value)
+                d[key[1]] = value.localised
+            elif isinstance(value, Data):
+                d.update(value.to_dict())
+            else:
+                d.update(value)
 
-        return ValuesView(self)
+        d.update(self._unknown)
+        return d
 
     def __deepcopy__(self, memo) -> _Any:
 
@@ -456,17 +921,18 @@ class Data(_Mapping):
             for name, value in self._data.items():
                 attr = self._attrs[name]
 
+                if attr.delegate and issubclass(attr.type, L):
+                    key1, key2 = attr.key
+                    d[key1] = str(value)
+                    d[key2] = value.localised
+                    continue
+
                 if attr.revert:
                     value = attr.revert(value,
                                         {id(_REVERT_MARKER): _REVERT_MARKER})
 
                 if attr.delegate:
-                    if not issubclass(attr.type, L):
-                        d.update(value)
-                    else:
-                        key1, key2 = attr.key
-                        d[key1] = str(value)
-                        d[key1] = value.localised
+                    d.update(value)
                 else:
                     d[attr.key] = value
 
@@ -475,10 +941,40 @@ class Data(_Mapping):
 
         obj = super().__new__(type(self))
         memo[id(self)] = obj
-        obj._data = {k: _deepcopy(v, memo) for k, v in self._data}
-        obj._unknown = {k: _deepcopy(v, memo) for k, v in self._unknown}
+        obj._data = {k: _deepcopy(v, memo) for k, v in self._data.items()}
+        obj._unknown = {k: _deepcopy(v, memo)
+                        for k, v in self._unknown.items()}
+
+        if self._entries_cls:
+            obj._data = self._entries_cls.from_mapping(obj._data)
+            obj._unknown = obj._unknown or _NO_UNKNOWN
+
         return obj
 
+    def __reduce__(self) -> _Tuple:
+
+        # Attribute values in the order of _attrs, with None for absent
+        # ones, instead of the slots with their dicts and class names.
+
+        # A lazy decode leaves a dict even in compact classes.
+        if isinstance(self._data, _CompactEntries):
+            fields = [None if value is ABSENT else value
+                      for value in tuple.__iter__(self._data)]
+        else:
+            fields = list(map(self._data.get, self._attrs))
+
+        if self._epoch_fields:
+            local = _pendulum.local_timezone()
+
+            for i in self._epoch_fields:
+                value = fields[i]
+                if (value is not None and value.microsecond == 0
+                        and value.tzinfo is local):
+                    fields[i] = value.to_epoch()
+
+        return _restore_data, (type(self), tuple(fields),
+                               self._unknown or None)
+
     def __copy__(self) -> 'Data':
 
         obj = super().__new__(type(self))
@@ -487,6 +983,383 @@ class Data(_Mapping):
         return obj
 
 
+def _restore_data(cls: _Type[_D], fields: _Tuple[_Any, ...],
+                  unknown: _Optional[_Dict[str, _Any]]) -> _D:
+
+    obj = object.__new__(cls)
+
+    if cls._epoch_fields:
+        fields = list(fields)
+        local = _pendulum.local_timezone()
+
+        for i in cls._epoch_fields:
+            if type(fields[i]) is int:
+                fields[i] = DateTime.from_epoch(fields[i], local)
+
+    if cls._entries_cls:
+        obj._data = cls._entries_cls([ABSENT if value is None else value
+                                      for value in fields])
+        obj._unknown = unknown or _NO_UNKNOWN
+
+    else:
+        obj._data = {name: value for name, value in zip(cls._attrs, fields)
+                     if value is not None}
+        obj._unknown = {} if unknown is None else unknown
+
+    return obj
+
+
+class _DataKeysView(_KeysView):
+
+    __slots__ = ()
+
+
+class _DataItemsView(_ItemsView):
+
+    __slots__ = ()
+
+    def __iter__(self) -> _Iterator[_Tuple[str, _Any]]:
+
+        return self._mapping.__iteritems__()
+
+
+class _DataValuesView(_ValuesView):
+
+    __slots__ = ()
+
+    def __iter__(self) -> _Iterator[_Any]:
+
+        return (value for _, value in self._mapping.__iteritems__())
+
+
+class _CompactEntries(tuple):
+
+    # Attribute values of compact Data objects, stored in the order of
+    # the class attributes, with ABSENT for those without a value. Only
+    # the read-only part of the dict interface is provided.
+
+    __slots__ = ()
+
+    _names: _Tuple[str, ...] = ()
+    _index: _Dict[str, int] = {}
+
+    @classmethod
+    def for_attrs(cls, owner: _Type[Data]) -> _Type['_CompactEntries']:
+
+        names = tuple(owner._attrs)
+
+        return type(f'{owner.__name__}Entries', (cls,), {
+            '__slots__': (),
+            '__module__': owner.__module__,
+            '_names': names,
+            '_index': {name: i for i, name in enumerate(names)},
+        })
+
+    @classmethod
+    def from_mapping(cls, mapping: _Mapping[str, _Any]) -> '_CompactEntries':
+
+        return cls(mapping.get(name, ABSENT) for name in cls._names)
+
+    def __getitem__(self, name: str) -> _Any:
+
+        value = super().__getitem__(self._index[name])
+        if value is ABSENT:
+            raise KeyError(name)
+
+        return value
+
+    def get(self, name: str, default: _Any = None) -> _Any:
+
+        i = self._index.get(name)
+        if i is None:
+            return default
+
+        value = super().__getitem__(i)
+        return default if value is ABSENT else value
+
+    def __contains__(self, name) -> bool:
+
+        i = self._index.get(name)
+        return i is not None and super().__getitem__(i) is not ABSENT
+
+    def __iter__(self) -> _Iterator[str]:
+
+        return (name for name, value in zip(self._names, super().__iter__())
+                if value is not ABSENT)
+
+    def __len__(self) -> int:
+
+        return sum(value is not ABSENT for value in super().__iter__())
+
+    def keys(self) -> _Iterator[str]:
+
+        return iter(self)
+
+    def values(self) -> _Iterator[_Any]:
+
+        return (value for value in super().__iter__() if value is not ABSENT)
+
+    def items(self) -> _Iterator[_Tuple[str, _Any]]:
+
+        return ((name, value)
+                for name, value in zip(self._names, super().__iter__())
+                if value is not ABSENT)
+
+    def copy(self) -> '_CompactEntries':
+
+        return self
+
+    def __repr__(self) -> str:
+
+        return repr(dict(self.items()))
+
+    def __reduce__(self) -> _Tuple:
+
+        return dict, (dict(self.items()),)
+
+
+class _Flyweights:
+
+    # Bounded LRU cache of immutable Data objects keyed by the structure
+    # of the mapping they were decoded from.
+
+    __slots__ = ('owner', 'maxsize', 'hits', 'misses', '_cache')
+
+    all: _List['_Flyweights'] = []
+
+    owner: _Type[Data]
+    maxsize: int
+    hits: int
+    misses: int
+
+    _cache: _Dict[_Any, Data]
+
+    def __init__(self, owner: _Type[Data], maxsize: int) -> None:
+
+        self.owner = owner
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+
+        self._cache = {}
+
+        self.all.append(self)
+
+    def __repr__(self) -> str:
+
+        return (f"{type(self).__name__}({self.owner.__qualname__},"
+                f" maxsize={self.maxsize}, hits={self.hits},"
+                f" misses={self.misses}, size={len(self._cache)})")
+
+    def __len__(self) -> int:
+
+        return len(self._cache)
+
+    def __bool__(self) -> bool:
+
+        return True
+
+    def clear(self) -> None:
+
+        self._cache.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, data: _Mapping[str, _Any], copy: bool,
+            trusted=False) -> Data:
+
+        # Objects decoded without validation are never handed to a caller
+        # that asked for it, so trusted is part of the key.
+        try:
+            key = (trusted, _freeze(data))
+            obj = self._cache.pop(key)
+
+        except TypeError:
+            key = None
+
+        except KeyError:
+            pass
+
+        else:
+            self.hits += 1
+            self._cache[key] = obj
+            return obj
+
+        self.misses += 1
+
+        if trusted:
+            if copy or not isinstance(data, _MutableMapping):
+                data = dict(data)
+
+            obj = self.owner._decode_trusted(data)
+
+        else:
+            if copy or not isinstance(data, _MutableMapping):
+                data = _deepcopy(data)
+
+            obj = self.owner._decode(data)
+
+        if key is not None:
+            self._cache[key] = obj
+            if len(self._cache) > self.maxsize:
+                del self._cache[next(iter(self._cache))]
+
+        return obj
+
+
+def _freeze(value: _Any) -> _Any:
+
+    # Hashable twin of a JSON-like structure. Leaves other than str carry
+    # their type, so that e.g. 1, 1.0 and True do not end up equal.
+
+    if isinstance(value, str):
+        return value
+
+    if isinstance(value, _Mapping):
+        return dict, tuple((k, _freeze(v)) for k, v in value.items())
+
+    if isinstance(value, (list, tuple)):
+        return list, tuple(_freeze(v) for v in value)
+
+    return type(value), value
+
+
+def flyweight_stats() -> _Dict[str, _Tuple[int, int, int]]:
+
+    return {f"{flyweights.owner.__module__}.{flyweights.owner.__qualname__}":
+            (flyweights.hits, flyweights.misses, len(flyweights))
+            for flyweights in _Flyweights.all}
+
+
+class _ReadOnlyDict(dict):
+
+    __slots__ = ()
+
+    def _read_only(self, *args, **kwargs) -> None:
+
+        raise TypeError(f"{type(self).__name__} is read-only")
+
+    __setitem__ = __delitem__ = __ior__ = _read_only
+    clear = pop = popitem = setdefault = update = _read_only
+
+    def __reduce__(self) -> str:
+
+        return '_NO_UNKNOWN'
+
+
+# Shared by compact Data objects without any unknown members.
+_NO_UNKNOWN = _ReadOnlyDict()
+
+
+class _LazyEntries(dict):
+
+    __slots__ = ('_attrs', '_pending', '_trusted')
+
+    _attrs: _Dict[str, 'Attr']
+    _pending: _Dict[str, _Any]
+    _trusted: bool
+
+    def __init__(self, attrs: _Dict[str, 'Attr'], trusted=False) -> None:
+
+        super().__init__()
+
+        self._attrs = attrs
+        self._pending = {}
+        self._trusted = trusted
+
+    def defer(self, name: str, value: _Any) -> None:
+
+        self._pending[name] = value
+
+    def resolve_all(self) -> None:
+
+        if not self._pending:
+            return
+
+        entries = {}
+        for name in self._attrs:
+            try:
+                entries[name] = self[name]
+            except KeyError:
+                pass
+
+        super().clear()
+        super().update(entries)
+
+    def __missing__(self, name: str) -> _Any:
+
+        try:
+            value = self._pending.pop(name)
+        except KeyError:
+            raise KeyError(name) from None
+
+        if self._trusted and not _TRUSTED.get():
+            with trusted_decoding():
+                value = Data._init_entry(self._attrs[name], value, True)
+
+        else:
+            value = Data._init_entry(self._attrs[name], value, self._trusted)
+
+        if value is None:
+            raise KeyError(name)
+
+        super().__setitem__(name, value)
+        return value
+
+    def __contains__(self, name) -> bool:
+
+        if name not in self._pending:
+            return super().__contains__(name)
+
+        try:
+            self[name]
+        except KeyError:
+            return False
+
+        return True
+
+    def get(self, name: str, default: _Any = None) -> _Any:
+
+        try:
+            return self[name]
+        except KeyError:
+            return default
+
+    def __iter__(self) -> _Iterator[str]:
+
+        self.resolve_all()
+        return super().__iter__()
+
+    def __len__(self) -> int:
+
+        self.resolve_all()
+        return super().__len__()
+
+    def keys(self) -> _KeysView:
+
+        self.resolve_all()
+        return super().keys()
+
+    def values(self) -> _ValuesView:
+
+        self.resolve_all()
+        return super().values()
+
+    def items(self) -> _ItemsView:
+
+        self.resolve_all()
+        return super().items()
+
+    def copy(self) -> dict:
+
+        self.resolve_all()
+        return dict(self)
+
+    def __reduce__(self) -> _Tuple:
+
+        return dict, (self.copy(),)
+
+
 class Attr:
 
     def __init__(
@@ -638,6 +1511,27 @@ def _r_coll(c: _Collection, memo) -> list:
     return l
 
 
+_MEMOLESS_REVERTS = frozenset((_r_text, _r_bool, _r_int, _r_real))
+
+
+def _export(revert: _Callable[[_Any, _Dict], _Any], value: _Any) -> _Any:
+
+    # The counterpart of revert() used by Data.to_dict(), which only
+    # builds new containers where reverting changes their type.
+
+    if revert is _deepcopy and isinstance(value, Data):
+        return value.to_dict()
+
+    if revert is _r_coll:
+        return [v.to_dict() if isinstance(v, Data) else v for v in value]
+
+    if revert is _r_map:
+        return {str(k): v.to_dict() if isinstance(v, Data) else v
+                for k, v in value.items()}
+
+    return revert(value, {id(_REVERT_MARKER): _REVERT_MARKER})
+
+
 # noinspection PyArgumentList
 _FUNC_DEFAULT_MATRIX = (
     # abstract,        concrete,  precheck,                           revert
@@ -657,6 +1551,130 @@ _FUNC_DEFAULT_MATRIX = (
 )
 
 
+def _make_decoder(cls: _Type[Data], trusted=False) -> _Callable:
+
+    # Generates the equivalent of Data._decode_generic() specialised for
+    # the attributes of cls, with all decisions that only depend on the
+    # attributes resolved up front.
+
+    compact = cls._entries_cls is not None
+
+    namespace = {'ABSENT': ABSENT, 'new': object.__new__,
+                 'entries_cls': cls._entries_cls, 'no_unknown': _NO_UNKNOWN}
+    lines = [
+        'def _decode(cls, data):',
+        '    obj = new(cls)',
+        '    entries = {}',
+        '    pop = data.pop',
+    ]
+
+    def init_entry(i: int, attr: Attr, indent: str) -> None:
+
+        if attr.precheck and not trusted:
+            namespace[f'precheck{i}'] = attr.precheck
+            lines.extend([
+                f'{indent}if not precheck{i}(value):',
+                f'{indent}    raise ValueError(',
+                f'{indent}        f"invalid value {{value!r}}'
+                f' for member {{key{i}}}"',
+                f'{indent}    )',
+            ])
+
+        if attr.convert:
+            namespace[f'convert{i}'] = attr.convert
+            lines.append(f'{indent}value = convert{i}(value)')
+
+        else:
+            namespace[f'type{i}'] = attr.type
+            lines.extend([
+                f'{indent}if not isinstance(value, type{i}):',
+                f'{indent}    value = type{i}(value)',
+            ])
+
+        if attr.validate and not trusted:
+            namespace[f'validate{i}'] = attr.validate
+            lines.extend([
+                f'{indent}if not validate{i}(value):',
+                f'{indent}    raise ValueError(',
+                f'{indent}        f"invalid value {{value!r}}'
+                f' for member {{key{i}}}"',
+                f'{indent}    )',
+            ])
+
+    def default(i: int, attr: Attr, indent: str) -> None:
+
+        if attr.default_factory is type(None):
+            lines.append(f'{indent}value = None')
+
+        else:
+            namespace[f'default{i}'] = attr.default_factory
+            lines.append(f'{indent}value = default{i}()')
+
+    for i, (name, attr) in enumerate(cls._attrs.items()):
+
+        namespace[f'key{i}'] = attr.key
+
+        if not attr.delegate:
+            lines.extend([
+                f'    value = pop({attr.key!r}, ABSENT)',
+                '    if value is ABSENT:',
+            ])
+            default(i, attr, ' ' * 8)
+            lines.append('    else:')
+            init_entry(i, attr, ' ' * 8)
+
+        elif issubclass(attr.type, L):
+            pops = ', '.join(f'pop({key!r}, None)' for key in attr.key)
+            lines.extend([
+                f'    value = [{pops}]',
+                '    if value[0] is None:',
+            ])
+            default(i, attr, ' ' * 8)
+            lines.append('    else:')
+            init_entry(i, attr, ' ' * 8)
+
+        else:
+            lines.append('    value = {}')
+            for key in attr.key:
+                lines.extend([
+                    f'    item = pop({key!r}, ABSENT)',
+                    '    if item is not ABSENT:',
+                    f'        value[{key!r}] = item',
+                ])
+            init_entry(i, attr, ' ' * 4)
+
+        if compact:
+            lines.append(f'    v{i} = value if value is not None else ABSENT')
+
+        else:
+            lines.extend([
+                '    if value is not None:',
+                f'        entries[{name!r}] = value',
+            ])
+
+    if compact:
+        values = ''.join(f'v{i}, ' for i in range(len(cls._attrs)))
+        lines.extend([
+            f'    obj._data = entries_cls(({values}))',
+            '    obj._unknown = data or no_unknown',
+            '    return obj',
+        ])
+
+    else:
+        lines.extend([
+            '    obj._data = entries',
+            '    obj._unknown = data',
+            '    return obj',
+        ])
+
+    exec('\n'.join(lines), namespace)
+
+    decoder = namespace['_decode']
+    decoder.__qualname__ = (f'{cls.__qualname__}._decode_trusted' if trusted
+                            else f'{cls.__qualname__}._decode')
+    return decoder
+
+
 def _py2key(name: str) -> str:
 
     return ''.join(
@@ -0,0 +1,7 @@
+#!/usr/bin/env python3
+
+import pathlib
+import sys
+
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent / 'src'))
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+
+import gc
+import json
+import warnings
+
+import pytest
+import trio
+
+from continued.journal import Backfill
+
+
+def _line(event, t, **fields):
+
+    record = {'timestamp': f'2020-01-01T00:{t // 60:02}:{t % 60:02}Z',
+              'event': event}
+    record.update(fields)
+    return json.dumps(record) + '\n'
+
+
+@pytest.fixture
+def archive(tmp_path):
+
+    (tmp_path / 'Journal.200101000000.01.log').write_text(
+        _line('Fileheader', 0, part=1)
+        + ''.join(_line('Music', i, MusicTrack=str(i)) for i in range(1, 20))
+        + _line('Continued', 20, part=2)
+    )
+    (tmp_path / 'Journal.200101000000.02.log').write_text(
+        _line('Fileheader', 21, part=2) + _line('Music', 22, MusicTrack='a')
+    )
+    # Just created by the game, and one cut short.
+    (tmp_path / 'Journal.200101000100.01.log').write_text('')
+    (tmp_path / 'Journal.200101000200.01.log').write_text('{"timest')
+    (tmp_path / 'Journal.200101000300.01.log').write_text(
+        _line('Fileheader', 180, part=1) + _line('Music', 181, MusicTrack='b')
+    )
+
+    return tmp_path
+
+
+@pytest.mark.parametrize('processes', [1, 2])
+def test_backfill_skips_invalid_logs(archive, processes):
+
+    async def main():
+
+        backfill = Backfill(archive, processes=processes)
+
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter('always', ResourceWarning)
+            tracks = [event.music_track async for event in backfill]
+            gc.collect()
+
+        assert not [w for w in caught
+                    if issubclass(w.category, ResourceWarning)]
+
+        return backfill, tracks
+
+    backfill, tracks = trio.run(main)
+
+    assert tracks == [str(i) for i in range(1, 20)] + ['a', 'b']
+    assert backfill.files == 3
+    assert backfill.events == 21
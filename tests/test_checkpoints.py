@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+
+import json
+
+import pytest
+import trio
+import trio.testing
+
+from continued.journal import _Checkpoints, _Journal, _LogFile
+
+
+@pytest.mark.parametrize('content', [
+    'not json',
+    '[1, 2]',
+    '{"Journal.200101000000.01.log": 12}',
+    '{"Journal.200101000000.01.log": {"offset": 1}}',
+    '{"Journal.200101000000.01.log": {"offset": 1, "colour": "red"}}',
+])
+def test_load_discards_malformed(tmp_path, content):
+
+    path = tmp_path / 'checkpoints.json'
+    path.write_text(content, encoding='utf-8')
+    checkpoints = _Checkpoints(path)
+
+    trio.run(checkpoints.load)
+
+    assert checkpoints._entries == {}
+
+
+def test_save_and_load(tmp_path):
+
+    path = tmp_path / 'checkpoints.json'
+    log_file = _LogFile(tmp_path / 'Journal.200101000000.01.log')
+
+    checkpoints = _Checkpoints(path)
+    checkpoints.update(log_file, 120, 'abcd')
+    trio.run(checkpoints.save)
+
+    loaded = _Checkpoints(path)
+    trio.run(loaded.load)
+
+    assert loaded.get(log_file) == _Checkpoints.Entry(120, 'abcd')
+
+
+def test_checkpoint_survives_save_error(tmp_path):
+
+    # A directory in the way of the file makes the save fail.
+    path = tmp_path / 'checkpoints.json'
+    path.mkdir()
+
+    journal = _Journal(checkpoints=_Checkpoints(path))
+    journal.log_file = _LogFile(tmp_path / 'Journal.200101000000.01.log')
+    journal.fingerprint = 'abcd'
+
+    trio.run(journal._checkpoint, 120)
+
+    assert journal.checkpoints.get(journal.log_file).offset == 120
+    assert path.is_dir()
+
+
+def test_checkpoint_saves_throttled(tmp_path):
+
+    path = tmp_path / 'checkpoints.json'
+
+    journal = _Journal(checkpoints=_Checkpoints(path))
+    journal.CHECKPOINT_BYTES = 1000
+    journal.log_file = _LogFile(tmp_path / 'Journal.200101000000.01.log')
+    journal.fingerprint = 'abcd'
+
+    def saved():
+        return json.loads(path.read_text())[journal.log_file.path.name][
+            'offset']
+
+    async def main():
+
+        await journal._checkpoint(100)
+        assert saved() == 100
+
+        await journal._checkpoint(200)
+        await journal._checkpoint(1000)
+        assert saved() == 100
+
+        await journal._checkpoint(1100)
+        assert saved() == 1100
+
+        await journal._checkpoint(1200)
+        assert saved() == 1100
+
+        await journal._checkpoint(1200, save=True)
+        assert saved() == 1200
+
+        await journal._checkpoint(1300)
+        clock.jump(journal.CHECKPOINT_INTERVAL)
+        await journal._checkpoint(1400)
+        assert saved() == 1400
+
+    clock = trio.testing.MockClock()
+    trio.run(main, clock=clock)
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+
+import importlib.util
+import json
+
+import pytest
+import trio
+
+from continued import data
+from continued.types import L
+
+np = pytest.importorskip('numpy')
+
+from continued.columnar import (  # noqa: E402
+    CommodityTable, EventColumns, export_archive,
+)
+
+
+def _commodities():
+
+    return [
+        data.Commodity(id=1, name=L('$gold_name;', 'Gold'),
+                       category=L('$MARKET_category_metals;', 'Metals'),
+                       buy_price=100, sell_price=90),
+        data.Commodity(id=2, name=L('$tea_name;', 'Tea'),
+                       category=L('$MARKET_category_foods;', 'Foods'),
+                       buy_price=10, sell_price=9, mean_price=20, stock=0,
+                       rare=False),
+    ]
+
+
+def test_round_trip_keeps_absent_fields_absent():
+
+    commodities = _commodities()
+    table = CommodityTable.from_commodities(commodities)
+
+    assert list(table) == commodities
+    assert table[0].to_dict() == commodities[0].to_dict()
+    assert 'MeanPrice' not in table[0].to_dict()
+    assert table[1].stock == 0 and table[1].rare is False
+    assert table['mean_price'].mask.tolist() == [True, False]
+
+
+def test_profit_masks_missing_prices():
+
+    table = CommodityTable.from_commodities(_commodities())
+
+    assert table.profit().tolist() == [None, 10]
+
+    other = CommodityTable.from_items([
+        {'id': 1, 'Name': 'gold', 'BuyPrice': 80},
+        {'id': 2, 'Name': 'tea', 'SellPrice': 50},
+    ])
+    assert table.profit(other).tolist() == [None, 40]
+    assert table.profit(other[:0]).tolist() == [-100, -10]
+    assert table[1:].profit(other).tolist() == [40]
+
+
+def _line(event, t, **fields):
+
+    record = {'timestamp': f'2020-01-01T{t // 3600:02}:{t // 60 % 60:02}:'
+                           f'{t % 60:02}Z',
+              'event': event}
+    record.update(fields)
+    return json.dumps(record) + '\n'
+
+
+@pytest.fixture
+def archive(tmp_path):
+
+    # MarketSell events with AvgPricePaid now and then, and one MarketID
+    # too large for int64 late in the log.
+    lines = [_line('Fileheader', 0, part=1)]
+
+    for i in range(1, 60):
+        fields = {'MarketID': 2 ** 64 if i == 50 else i % 7, 'Type': 'gold',
+                  'Count': i, 'SellPrice': 10, 'TotalSale': 10 * i}
+        if i % 3 == 0:
+            fields['AvgPricePaid'] = 8
+        lines.append(_line('MarketSell', i, **fields))
+        lines.append(_line('Music', i, MusicTrack=str(i % 4)))
+
+    path = tmp_path / 'journal'
+    path.mkdir()
+    (path / 'Journal.200101000000.01.log').write_text(''.join(lines))
+
+    return path
+
+
+def _export(archive, out_path, fmt, chunk_rows):
+
+    rows = trio.run(lambda: export_archive(archive, out_path, fmt=fmt,
+                                           chunk_rows=chunk_rows))
+
+    columns = {}
+    for event_name in rows:
+        table = EventColumns(out_path, event_name)
+        assert table.rows == rows[event_name]
+        columns[event_name] = {
+            column: (table[column].tolist(),
+                     np.ma.getmaskarray(table[column]).tolist())
+            for column in table
+        }
+
+    return rows, columns
+
+
+@pytest.mark.parametrize('fmt', [
+    'npy',
+    pytest.param('parquet', marks=pytest.mark.skipif(
+        importlib.util.find_spec('pyarrow') is None, reason="needs pyarrow"
+    )),
+])
+def test_export_in_chunks(tmp_path, archive, fmt):
+
+    rows, whole = _export(archive, tmp_path / 'whole', fmt, 1000)
+    chunked_rows, chunked = _export(archive, tmp_path / 'chunked', fmt, 8)
+
+    assert rows == chunked_rows == {'MarketSell': 59, 'Music': 59}
+    assert chunked == whole
+
+    market_ids, _ = whole['MarketSell']['market_id']
+    assert market_ids[:2] == ['1', '2'] and market_ids[49] == str(2 ** 64)
+
+    avg_price_paid, missing = whole['MarketSell']['avg_price_paid']
+    assert missing == [i % 3 != 0 for i in range(1, 60)]
+    assert avg_price_paid[2] == 8
+
+    assert not any(p.name.endswith('.part')
+                   for p in (tmp_path / 'chunked').rglob('*'))
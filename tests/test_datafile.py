@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+
+import collections
+import random
+
+from continued import events
+from continued.journal import _DataFile
+
+
+class _DequeBuffer:
+
+    # The buffer _DataFile used to have, newest first, as the reference.
+
+    def __init__(self, backlog):
+
+        self._buffer = collections.deque(maxlen=1 + backlog)
+
+    def contents(self):
+
+        return list(reversed(self._buffer))
+
+    def enqueue(self, event):
+
+        if not self._buffer or event >= self._buffer[0]:
+            self._buffer.appendleft(event)
+            return
+
+        if len(self._buffer) == self._buffer.maxlen:
+            self._buffer.pop()
+
+        for i, compare in enumerate(self._buffer):
+            if event >= compare:
+                self._buffer.insert(i, event)
+                break
+        else:
+            self._buffer.append(event)
+
+    def find(self, timestamp):
+
+        if not self._buffer:
+            return None
+
+        event = self._buffer[0]
+        if timestamp >= event._timestamp:
+            return event if timestamp == event._timestamp else None
+
+        for event in reversed(self._buffer):
+            if timestamp <= event._timestamp:
+                return event
+
+    def purge_up_to(self, timestamp):
+
+        if not self._buffer:
+            return
+
+        if timestamp >= self._buffer[0]._timestamp:
+            self._buffer.clear()
+            return
+
+        while timestamp >= self._buffer[-1]._timestamp:
+            self._buffer.pop()
+
+
+def _market(second, market_id):
+
+    return events.Market.from_dict({
+        'event': 'Market',
+        'timestamp': f'2020-01-01T00:00:{second:02}Z',
+        'MarketID': market_id,
+    })
+
+
+def _timestamp(second):
+
+    return _market(second, 0)._timestamp
+
+
+def test_buffer_matches_deque():
+
+    rng = random.Random(20200101)
+
+    for run in range(3000):
+
+        backlog = rng.randint(0, 5)
+        data_file = _DataFile(events.Market, 'Market.json', backlog=backlog)
+        model = _DequeBuffer(backlog)
+
+        # Few distinct timestamps, so that ties and out of order
+        # snapshots are common.
+        for op in range(40):
+            second = rng.randint(0, 9)
+            kind = rng.random()
+
+            if kind < 0.5:
+                event = _market(second, run * 40 + op)
+                data_file.enqueue(event)
+                model.enqueue(event)
+
+            elif kind < 0.85:
+                expected = model.find(_timestamp(second))
+                actual = data_file.find(_timestamp(second))
+                assert actual is expected, (run, op)
+
+            else:
+                data_file.purge_up_to(_timestamp(second))
+                model.purge_up_to(_timestamp(second))
+
+            assert [id(e) for e in data_file._buffer] == [
+                id(e) for e in model.contents()
+            ], (run, op)
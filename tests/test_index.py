@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+
+import bz2
+import gzip
+import json
+import lzma
+
+import pytest
+
+from continued.index import EventIndex
+
+
+try:
+    import zstandard
+
+except ImportError:
+    zstandard = None
+
+
+def _zstd_compress(data: bytes) -> bytes:
+
+    if zstandard is None:
+        pytest.skip("zstandard is not installed")
+
+    return zstandard.ZstdCompressor().compress(data)
+
+
+COMPRESSORS = {
+    '.gz': gzip.compress,
+    '.bz2': bz2.compress,
+    '.xz': lzma.compress,
+    '.zst': _zstd_compress,
+}
+
+
+def _write_log(path, lines=60):
+
+    records = [{'timestamp': '2020-01-01T00:00:00Z', 'event': 'Fileheader',
+                'part': 1}]
+    records += [{'timestamp': f'2020-01-01T00:{i // 60:02}:{i % 60:02}Z',
+                 'event': 'MarketSell', 'MarketID': i % 3, 'Count': i}
+                for i in range(lines)]
+
+    path.write_bytes(''.join(json.dumps(r) + '\n' for r in records).encode())
+
+
+@pytest.mark.parametrize('suffix', ['', *COMPRESSORS])
+def test_index_and_query(tmp_path, suffix):
+
+    plain = tmp_path / 'Journal.200101120000.01.log'
+    _write_log(plain)
+
+    if suffix:
+        compressed = plain.with_name(plain.name + suffix)
+        compressed.write_bytes(COMPRESSORS[suffix](plain.read_bytes()))
+        plain.unlink()
+
+    with EventIndex(tmp_path, tmp_path / 'index.sqlite') as index:
+        assert index.update() == 60
+        assert index.update() == 0
+
+        events = list(index.query('MarketSell', market_id=1))
+        assert [event.count for event in events] == list(range(1, 60, 3))
+
+
+@pytest.mark.parametrize('suffix', list(COMPRESSORS))
+def test_compress_in_place(tmp_path, suffix):
+
+    plain = tmp_path / 'Journal.200101120000.01.log'
+    _write_log(plain)
+
+    with EventIndex(tmp_path, tmp_path / 'index.sqlite') as index:
+        assert index.update() == 60
+
+        compressed = plain.with_name(plain.name + suffix)
+        compressed.write_bytes(COMPRESSORS[suffix](plain.read_bytes()))
+        plain.unlink()
+
+        assert index.update() == 0
+        assert len(list(index.query(market_id=2))) == 20
+
+
+@pytest.mark.parametrize('suffix', list(COMPRESSORS))
+def test_read_backward(tmp_path, suffix):
+
+    plain = tmp_path / 'Journal.200101120000.01.log'
+    _write_log(plain)
+    compressed = plain.with_name(plain.name + suffix)
+    compressed.write_bytes(COMPRESSORS[suffix](plain.read_bytes()))
+    plain.unlink()
+
+    with EventIndex(tmp_path, tmp_path / 'index.sqlite') as index:
+        index.update()
+
+        files = {}
+        locations = index.locate('MarketSell')[::-1]
+
+        try:
+            # noinspection PyProtectedMember
+            counts = [index._read(files, *location).count
+                      for location in locations]
+
+        finally:
+            for f in files.values():
+                f.close()
+
+        assert counts == list(range(59, -1, -1))
+
+
+def test_skip_invalid_lines(tmp_path):
+
+    first = tmp_path / 'Journal.200101120000.01.log'
+    _write_log(first, lines=10)
+    with first.open('ab') as f:
+        f.write(b'{"event": "MarketSell", "MarketID": 1}\n')
+        f.write(b'{"timestamp": "2020-01-01T01:00:00Z", "event": \n')
+        f.write(b'{"timestamp": "yesterday", "event": "MarketSell"}\n')
+        f.write(b'[1, 2]\n')
+        f.write(json.dumps({'timestamp': '2020-01-01T01:00:00Z',
+                            'event': 'MarketSell', 'MarketID': 1,
+                            'Count': 99}).encode() + b'\n')
+
+    _write_log(tmp_path / 'Journal.200101130000.01.log', lines=5)
+
+    with EventIndex(tmp_path, tmp_path / 'index.sqlite') as index:
+        assert index.update() == 16
+        assert index.invalid == 4
+        assert index.update() == 0
+
+        events = list(index.query('MarketSell', market_id=1))
+        assert [event.count for event in events] == [1, 1, 4, 4, 7, 99]
@@ -0,0 +1,355 @@
+#!/usr/bin/env python3
+
+import json
+
+import trio
+import watchgod
+
+from continued import events
+from continued.journal import (
+    EventMap, _Checkpoints, _DataFile, _Journal, _LogChanges, _LogFile,
+    watch_journal,
+)
+
+
+def _log_name(second, part=1):
+
+    return f'Journal.2001010000{second:02}.{part:02}.log'
+
+
+def test_log_changes_coalesce(tmp_path):
+
+    async def main():
+
+        log_changes = _LogChanges()
+
+        for i in range(300):
+            log_changes.notify(trio.Path(tmp_path / _log_name(1)))
+        log_changes.notify(trio.Path(tmp_path / _log_name(2)))
+        log_changes.notify(trio.Path(tmp_path / _log_name(1)))
+
+        assert log_changes.coalesced == 301
+        assert await log_changes.wait() == trio.Path(tmp_path / _log_name(2))
+
+        with trio.move_on_after(0.1) as cancel_scope:
+            await log_changes.wait()
+        assert cancel_scope.cancelled_caught
+
+    trio.run(main)
+
+
+def test_watch_journal_with_stalled_reader(tmp_path):
+
+    path = str(tmp_path / _log_name(1))
+
+    async def changes():
+        for _ in range(300):
+            yield {(watchgod.Change.modified, path)}
+
+    async def main():
+
+        log_changes = _LogChanges()
+        await watch_journal(changes(), {}, log_changes)
+
+        assert await log_changes.wait() == trio.Path(path)
+
+    trio.run(main)
+
+
+class _Recorder(_Journal):
+
+    def __init__(self, *args, **kwargs):
+
+        super().__init__(*args, **kwargs)
+        self.handled = []
+
+    def _handle_event(self, event):
+
+        self.handled.append(event)
+        return super()._handle_event(event)
+
+
+def _line(event, second, **fields):
+
+    record = {'timestamp': f'2020-01-01T00:00:{second:02}Z', 'event': event}
+    record.update(fields)
+    return json.dumps(record).encode('utf-8') + b'\n'
+
+
+async def _until(condition, timeout=5):
+
+    # File reads run in worker threads, which tasks merely wait for.
+    with trio.fail_after(timeout):
+        while not condition():
+            await trio.sleep(0.01)
+
+
+def test_live_log_follows_notifications(tmp_path):
+
+    first = tmp_path / _log_name(1)
+    second = tmp_path / _log_name(2)
+
+    async def main():
+
+        EventMap.set({})
+        journal = _Recorder()
+        log_changes = _LogChanges()
+
+        first.write_bytes(_line('Fileheader', 0, part=1)
+                          + _line('Music', 1, MusicTrack='A'))
+
+        async with trio.open_nursery() as nursery:
+            nursery.start_soon(journal.async_loop, log_changes)
+
+            log_changes.notify(trio.Path(first))
+            await _until(lambda: len(journal.handled) == 1)
+
+            with first.open('ab') as f:
+                for i in range(50):
+                    f.write(_line('Music', 2, MusicTrack=str(i)))
+                    log_changes.notify(trio.Path(first))
+
+            second.write_bytes(_line('Fileheader', 3, part=1)
+                               + _line('Music', 4, MusicTrack='B'))
+            log_changes.notify(trio.Path(second))
+            log_changes.notify(trio.Path(first))
+
+            await _until(lambda: len(journal.handled) == 52)
+            await trio.sleep(0.1)
+            nursery.cancel_scope.cancel()
+
+        assert len(journal.handled) == 52
+        assert journal.handled[-1].music_track == 'B'
+        assert journal.log_file.path == trio.Path(second)
+
+    trio.run(main)
+
+
+def _write_market(path, second, market_id):
+
+    path.write_bytes(_line('Market', second, MarketID=market_id))
+
+
+async def _start_reorder(nursery, tmp_path, log, checkpoints=None):
+
+    # A journal behind a Market side file holding a snapshot older than
+    # any Market event in the log, so those wait for the next one.
+
+    market = tmp_path / 'Market.json'
+    _write_market(market, 0, 0)
+
+    data_file = _DataFile(events.Market, trio.Path(market))
+    EventMap.set({data_file.event_name: data_file})
+    nursery.start_soon(data_file.async_loop)
+    await _until(lambda: data_file.reads == 1)
+
+    journal = _Recorder(checkpoints=checkpoints)
+    log_changes = _LogChanges()
+    nursery.start_soon(journal.async_loop, log_changes)
+    log_changes.notify(trio.Path(log))
+
+    return journal, data_file
+
+
+def _names(journal):
+
+    return [event._event_name for event in journal.handled]
+
+
+def test_late_side_file_keeps_log_order(tmp_path):
+
+    log = tmp_path / _log_name(1)
+    log.write_bytes(_line('Fileheader', 0, part=1)
+                    + _line('Market', 1, MarketID=1)
+                    + _line('Music', 2, MusicTrack='A')
+                    + _line('Music', 3, MusicTrack='B'))
+
+    async def main():
+
+        async with trio.open_nursery() as nursery:
+            journal, data_file = await _start_reorder(nursery, tmp_path, log)
+
+            # Both Music events and the end of file marker are queued
+            # behind the Market event.
+            await _until(lambda: journal._in_flight == 4)
+            assert journal.handled == []
+
+            _write_market(tmp_path / 'Market.json', 1, 7)
+            data_file.notify()
+
+            await _until(lambda: len(journal.handled) == 3)
+            nursery.cancel_scope.cancel()
+
+        assert _names(journal) == ['Market', 'Music', 'Music']
+        assert journal.handled[0].market_id == 7
+        assert [e.music_track for e in journal.handled[1:]] == ['A', 'B']
+        assert journal.hol_delay > 0
+
+    trio.run(main)
+
+
+def test_shutdown_behind_side_file_checkpoints_its_offset(tmp_path):
+
+    log = tmp_path / _log_name(1)
+    lines = [_line('Fileheader', 0, part=1),
+             _line('Market', 1, MarketID=1),
+             _line('Music', 2, MusicTrack='A'),
+             _line('Shutdown', 3),
+             _line('Music', 4, MusicTrack='B')]
+    log.write_bytes(b''.join(lines))
+
+    path = tmp_path / 'checkpoints.json'
+
+    async def main():
+
+        async with trio.open_nursery() as nursery:
+            journal, data_file = await _start_reorder(
+                nursery, tmp_path, log, _Checkpoints(trio.Path(path))
+            )
+
+            await _until(lambda: journal._in_flight == 5)
+            assert journal.handled == []
+
+            _write_market(tmp_path / 'Market.json', 1, 7)
+            data_file.notify()
+
+            await _until(lambda: journal.log_file is None)
+            nursery.cancel_scope.cancel()
+
+        assert _names(journal) == ['Market', 'Music', 'Shutdown']
+
+        checkpoints = _Checkpoints(trio.Path(path))
+        await checkpoints.load()
+        entry = checkpoints.get(_LogFile(log))
+        assert entry.offset == len(b''.join(lines[:4]))
+        assert entry.timestamp == '2020-01-01T00:00:03Z'
+
+    trio.run(main)
+
+
+def test_continued_drains_enrichments_before_switching(tmp_path):
+
+    first = tmp_path / _log_name(1)
+    first.write_bytes(_line('Fileheader', 0, part=1)
+                      + _line('Market', 1, MarketID=1)
+                      + _line('Music', 2, MusicTrack='A')
+                      + _line('Continued', 3, part=2))
+
+    second = tmp_path / _log_name(1, part=2)
+    second.write_bytes(_line('Fileheader', 3, part=2)
+                       + _line('Music', 4, MusicTrack='B'))
+
+    path = tmp_path / 'checkpoints.json'
+
+    async def main():
+
+        async with trio.open_nursery() as nursery:
+            journal, data_file = await _start_reorder(
+                nursery, tmp_path, first, _Checkpoints(trio.Path(path))
+            )
+
+            # The Continued marker is queued, but the next part is not
+            # opened while the Market event is still in flight.
+            await _until(lambda: journal._in_flight == 3)
+            await trio.sleep(0.1)
+            assert journal.handled == []
+            assert journal.log_file == _LogFile(first)
+
+            _write_market(tmp_path / 'Market.json', 1, 7)
+            data_file.notify()
+
+            await _until(lambda: len(journal.handled) == 3)
+            nursery.cancel_scope.cancel()
+
+        assert _names(journal) == ['Market', 'Music', 'Music']
+        assert journal.handled[0].market_id == 7
+        assert journal.log_file == _LogFile(second)
+        assert journal.part == 2
+
+        entry = journal.checkpoints.get(_LogFile(first))
+        assert entry.offset == first.stat().st_size
+
+    trio.run(main)
+
+
+def _saved_offset(path, log):
+
+    return json.loads(path.read_text())[log.name]['offset']
+
+
+def _checkpointed_journal(tmp_path, interval):
+
+    # A journal saving checkpoints at most every interval seconds, and
+    # a log with one event for it.
+
+    log = tmp_path / _log_name(1)
+    log.write_bytes(_line('Fileheader', 0, part=1)
+                    + _line('Music', 1, MusicTrack='A'))
+
+    EventMap.set({})
+    journal = _Recorder(checkpoints=_Checkpoints(
+        trio.Path(tmp_path / 'checkpoints.json')))
+    journal.CHECKPOINT_INTERVAL = interval
+    log_changes = _LogChanges()
+
+    return journal, log, log_changes
+
+
+def test_idle_log_catches_up_on_checkpoints(tmp_path):
+
+    path = tmp_path / 'checkpoints.json'
+
+    async def main():
+
+        journal, log, log_changes = _checkpointed_journal(tmp_path, 0.5)
+
+        async with trio.open_nursery() as nursery:
+            nursery.start_soon(journal.async_loop, log_changes)
+            log_changes.notify(trio.Path(log))
+
+            await _until(lambda: len(journal.handled) == 1)
+            await _until(lambda: path.exists())
+            first = log.stat().st_size
+
+            with log.open('ab') as f:
+                f.write(_line('Music', 2, MusicTrack='B'))
+            log_changes.notify(trio.Path(log))
+
+            await _until(lambda: len(journal.handled) == 2)
+            assert _saved_offset(path, log) == first
+
+            await _until(lambda: _saved_offset(path, log)
+                         == log.stat().st_size)
+            nursery.cancel_scope.cancel()
+
+    trio.run(main)
+
+
+def test_checkpoint_saved_on_exit(tmp_path):
+
+    path = tmp_path / 'checkpoints.json'
+
+    async def main():
+
+        journal, log, log_changes = _checkpointed_journal(tmp_path, 3600)
+
+        async with trio.open_nursery() as nursery:
+            nursery.start_soon(journal.async_loop, log_changes)
+            log_changes.notify(trio.Path(log))
+
+            await _until(lambda: len(journal.handled) == 1)
+            await _until(lambda: path.exists())
+            first = log.stat().st_size
+
+            with log.open('ab') as f:
+                f.write(_line('Music', 2, MusicTrack='B'))
+            log_changes.notify(trio.Path(log))
+
+            await _until(lambda: len(journal.handled) == 2)
+            await trio.sleep(0.1)
+            assert _saved_offset(path, log) == first
+            nursery.cancel_scope.cancel()
+
+        assert _saved_offset(path, log) == log.stat().st_size
+
+    trio.run(main)
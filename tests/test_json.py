@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+
+import json
+
+import pytest
+
+from continued import _json
+
+
+CASES = [
+    b'{"a": 1, "b": [true, false, null], "c": "text"}',
+    b'{"MarketID": 128666762, "Price": -12.5e3}',
+    b'[12345678901234567890, -123456789012345678901234]',
+    b'{"a": "12345678901234567890", "b": 1}',
+    b'[NaN]',
+    b'[Infinity, -Infinity]',
+    b'{"a": NaN}',
+    b'["\\ud800"]',
+    b'["\\udc00\\ud83d"]',
+    b'["\\ud83d\\ude00"]',
+    '["\ud800"]',
+    b'["\xff"]',
+    b'["\xc3\x28"]',
+    b'["\xed\xa0\x80"]',
+    b'["a\x00b"]',
+    b'["a\tb"]',
+    b'["a\nb"]',
+    b'{"a": 1',
+    b'',
+    b'{"a": 1} x',
+    '{"a": "café"}',
+]
+
+
+def _loads(data):
+
+    if isinstance(data, (bytes, bytearray)):
+        data = bytes(data).decode('utf-8')
+
+    return json.loads(data)
+
+
+def _outcome(decode, data):
+
+    # Anything but a ValueError propagates and fails the test.
+    try:
+        return 'ok', decode(data)
+
+    except ValueError:
+        return 'error', None
+
+
+def _same(a, b):
+
+    # NaN compares unequal to itself, repr does not.
+    return type(a) is type(b) and repr(a) == repr(b)
+
+
+@pytest.fixture(params=['orjson', 'msgspec', 'json'])
+def backend(request, monkeypatch):
+
+    try:
+        decode, errors = _json._load_backend(request.param)
+
+    except ImportError:
+        pytest.skip(f"{request.param} is not installed")
+
+    monkeypatch.setattr(_json, '_decode_fast', decode)
+    monkeypatch.setattr(_json, '_DECODE_ERRORS', errors)
+
+    return request.param
+
+
+@pytest.mark.parametrize('data', CASES, ids=repr)
+def test_decode_matches_stdlib(backend, data):
+
+    expected = _outcome(_loads, data)
+    actual = _outcome(_json.decode, data)
+
+    assert actual[0] == expected[0]
+    if expected[0] == 'ok':
+        assert _same(actual[1], expected[1])
+
+
+@pytest.mark.parametrize('data', CASES[:4], ids=repr)
+def test_decode_buffers(backend, data):
+
+    assert _same(_json.decode(bytearray(data)), _loads(data))
+    assert _same(_json.decode(memoryview(data)), _loads(data))
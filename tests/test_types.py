@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+
+import copy
+import pickle
+
+import pendulum
+import pytest
+
+from continued import data
+from continued.types import DateTime, L
+
+
+def test_flyweight_trusted_separate():
+
+    record = {'StarSystem': 'Sol', 'SystemAddress': 1.5}
+
+    data.System.from_dict(record, trusted=True)
+
+    with pytest.raises(ValueError):
+        data.System.from_dict(record, trusted=False)
+
+    system = data.System.from_dict({'StarSystem': 'Sol', 'SystemAddress': 10})
+    assert data.System.from_dict({'StarSystem': 'Sol',
+                                  'SystemAddress': 10}) is system
+
+
+@pytest.mark.parametrize('cls, record', [
+    (data.Component, {'Name': 'gold', 'Percent': 12.5}),
+    (data.System, {'StarSystem': 'Sol', 'SystemAddress': 10,
+                   'StarPos': [0.0, 0.0, 0.0], 'Extra': 1}),
+])
+@pytest.mark.parametrize('lazy', [False, True])
+def test_pickle_round_trip(cls, record, lazy):
+
+    obj = cls.from_dict(record, lazy=lazy)
+    restored = pickle.loads(pickle.dumps(obj))
+
+    assert type(restored) is cls
+    assert restored == obj
+    assert restored.to_dict() == obj.to_dict()
+
+
+def test_l_layout_and_interning():
+
+    count = L._interned_count
+    texts = [L(f'o7 cmdr {i}', f'o7 CMDR {i}') for i in range(1000)]
+    texts += [L(f'o7 cmdr {i}') for i in range(1000)]
+
+    assert L._interned_count == count
+    assert not hasattr(L('o7'), '__dict__')
+    assert texts[0].localised == 'o7 CMDR 0'
+    assert texts[1000].localised == 'o7 cmdr 0'
+
+    symbol = L('$economy_Agri;', 'Agriculture')
+    assert L('$economy_Agri;', 'Agriculture') is symbol
+    assert not hasattr(symbol, '__dict__')
+    assert symbol.localised == 'Agriculture'
+    assert L('$economy_Agri;').localised == '$economy_Agri;'
+
+
+@pytest.mark.parametrize('value', [
+    L('$economy_Agri;', 'Agriculture'), L('$economy_Agri;'),
+    L('o7', 'o7!'), L('o7'), L(''),
+], ids=repr)
+def test_l_round_trip(value):
+
+    for restored in (pickle.loads(pickle.dumps(value)), copy.copy(value),
+                     copy.deepcopy(value)):
+        assert restored == value
+        assert restored.localised == value.localised
+        assert repr(restored) == repr(value)
+
+
+# Both 2021 DST transitions, in UTC seconds; Lord Howe shifts by 30 minutes.
+_TRANSITIONS = [
+    ('Europe/Berlin', 1616893200),
+    ('Europe/Berlin', 1635642000),
+    ('America/New_York', 1615705200),
+    ('America/New_York', 1636264800),
+    ('Australia/Lord_Howe', 1617462000),
+    ('Australia/Lord_Howe', 1633188600),
+]
+
+
+@pytest.mark.parametrize('zone, transition', _TRANSITIONS)
+def test_epoch_conversions_across_dst(zone, transition):
+
+    tz = pendulum.timezone(zone)
+    assert (pendulum.from_timestamp(transition - 1, tz=tz).utcoffset()
+            != pendulum.from_timestamp(transition, tz=tz).utcoffset())
+
+    # Seconds either side of the transition and of span boundaries,
+    # visited in both directions so that the offset to_epoch tries first
+    # is often the one from the other side.
+    seconds = set(range(transition - 3 * 3600, transition + 3 * 3600, 37))
+    for t in (transition, transition + DateTime.EPOCH_SPAN):
+        seconds.update(range(t - 2, t + 2))
+    seconds = sorted(seconds)
+
+    for t in seconds + seconds[::-1]:
+        exact = pendulum.from_timestamp(t, tz=tz)
+        offset = int(exact.utcoffset().total_seconds())
+
+        dt = DateTime.from_epoch(t, tz)
+        assert (dt.timetuple()[:6], dt.fold, dt.utcoffset()) == (
+            exact.timetuple()[:6], exact.fold, exact.utcoffset()
+        ), t
+        assert dt.to_epoch() == t
+        assert dt.to_elite_string() == exact.in_timezone(
+            pendulum.UTC).format('YYYY-MM-DDTHH:mm:ss[Z]')
+
+        shift = DateTime._shift(tz, t)
+        assert shift is None or shift == (offset, exact.fold), t